@@ -235,16 +235,16 @@ class AgentDataInitializer:
             
             # Insert landlords
             if landlord_dicts:
-                self.landlord_client.collection.insert_many(landlord_dicts)
+                self.landlord_client.bulk_insert(landlord_dicts)
             
             # Insert properties
             if property_dicts:
-                self.property_client.collection.insert_many(property_dicts)
+                self.property_client.bulk_insert(property_dicts)
             
             # Save tenant data
             tenant_dicts = [tenant.to_dict() for tenant in tenants]
             if tenant_dicts:
-                self.tenant_client.collection.insert_many(tenant_dicts)
+                self.tenant_client.bulk_insert(tenant_dicts)
             
             logger.info(f"Successfully saved {len(landlords)} landlords and {len(tenants)} tenants to MongoDB")
             
@@ -357,9 +357,9 @@ class AgentDataInitializer:
             
             # Insert data
             if landlord_dicts:
-                self.landlord_client.collection.insert_many(landlord_dicts)
+                self.landlord_client.bulk_insert(landlord_dicts)
             if property_dicts:
-                self.property_client.collection.insert_many(property_dicts)
+                self.property_client.bulk_insert(property_dicts)
             
             logger.info(f"Successfully initialized {len(landlords)} landlords and {len(properties)} properties")
             
@@ -457,9 +457,9 @@ class AgentDataInitializer:
         
         # Insert data
         if default_properties:
-            self.property_client.collection.insert_many(default_properties)
+            self.property_client.bulk_insert(default_properties)
         if default_landlords:
-            self.landlord_client.collection.insert_many(default_landlords)
+            self.landlord_client.bulk_insert(default_landlords)
             
         logger.info("Emergency default data creation completed")
 
@@ -470,7 +470,7 @@ class AgentDataInitializer:
         # Save to database
         tenant_dicts = [tenant.to_dict() for tenant in tenants]
         if tenant_dicts:
-            self.tenant_client.collection.insert_many(tenant_dicts)
+            self.tenant_client.bulk_insert(tenant_dicts)
         
         logger.info(f"Successfully generated {len(tenants)} tenants")
         # Convert ObjectId to string
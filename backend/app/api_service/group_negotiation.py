@@ -3,19 +3,19 @@ Multi-Agent Communication Service - Core functionality for tenant-landlord searc
 """
 
 import asyncio
-import uuid
+import itertools
+import secrets
 import sys
-from typing import List, Dict, Any, Optional, TypedDict
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple, TypedDict
 from datetime import datetime
 from loguru import logger
 import time
 
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage
 
 # Ensure logging configuration is correct, force display of INFO level messages
 logger.remove()  # Remove default handler
-logger.add(sys.stderr, level="INFO")  # Add stderr handler, set level to INFO
+logger.add(sys.stderr, level="INFO", enqueue=True)  # Add stderr handler, set level to INFO; writes happen on a background thread
 
 from app.mongo import MongoClientWrapper
 from app.agents.models import LandlordModel, TenantModel, PropertyModel
@@ -27,15 +27,162 @@ from app.conversation_service.meta_controller import (
     ExtendedMetaState,
     stream_conversation_with_state_update,
     meta_controller_graph,
+    get_default_llm,
 )
 from app.conversation_service.prompt.prompts import (
     MARKET_ANALYSIS_PROMPT,
 )
 from app.config import config
-from app.config import NEGOTIATION_ROUND
+from app.utils.clock import now_iso
 from app.utils.RateLimitBackOff import invoke_llm_with_backoff
 
 
+# Amenities that earn bonus points in property matching
+SCORED_AMENITIES = frozenset({"parking", "gym", "fitness", "pool"})
+
+
+def calculate_property_match_score(
+    tenant: TenantModel,
+    property_dict: Dict[str, Any],
+    pref_set: frozenset,
+    budget_80: float,
+    min_bed: int,
+    max_bed: int,
+) -> tuple[float, List[str]]:
+    """
+    Calculate matching score between tenant and property
+
+    Args:
+        tenant: Tenant model
+        property_dict: Property information dictionary
+        pref_set: Lowercased preferred area names
+        budget_80: 80% of the tenant's maximum budget
+        min_bed: Minimum acceptable bedrooms
+        max_bed: Maximum acceptable bedrooms
+
+    Returns:
+        Matching score (0-100) and list of matching reasons
+    """
+    score = 0
+    reasons = []
+
+    try:
+        # Budget matching (weight: 30 points)
+        monthly_rent = property_dict.get("monthly_rent", 0)
+        if monthly_rent <= budget_80:  # 租金不超过预算80%
+            score += 30
+            reasons.append(f"租金 ${monthly_rent} 在预算范围内")
+        elif monthly_rent <= tenant.max_budget:  # 租金在预算范围内但较高
+            score += 20
+            reasons.append(f"Rent ${monthly_rent} is close to budget limit")
+        else:
+            reasons.append(
+                f"Rent ${monthly_rent} exceeds budget ${tenant.max_budget}"
+            )
+
+        # Bedroom count matching (weight: 20 points)
+        bedrooms = property_dict.get("bedrooms", 0)
+        if min_bed <= bedrooms <= max_bed:
+            score += 20
+            reasons.append(f"{bedrooms} bedroom(s) meets requirements")
+        elif bedrooms == min_bed - 1 or bedrooms == max_bed + 1:
+            score += 10
+            reasons.append(f"{bedrooms} bedroom(s) close to requirements")
+        else:
+            reasons.append(
+                f"{bedrooms} bedroom(s) doesn't match requirements({min_bed}-{max_bed} bedrooms)"
+            )
+
+        # Geographic location matching (weight: 20 points)
+        property_location = property_dict.get("district", "").lower()
+        if property_location and pref_set:
+            if property_location in pref_set:
+                score += 20
+                reasons.append(f"Located in preferred area: {property_location}")
+            elif any(pref in property_location for pref in pref_set):
+                score += 10
+                reasons.append(f"Located in related area: {property_location}")
+
+        # Pet policy matching (weight: 10 points)
+        pets_allowed = property_dict.get("pets_allowed", False)
+        if tenant.has_pets and pets_allowed:
+            score += 10
+            reasons.append("Pets allowed")
+        elif not tenant.has_pets:
+            score += 5
+            reasons.append("No pet restriction impact")
+        elif tenant.has_pets and not pets_allowed:
+            reasons.append("Pets not allowed")
+
+        # Smoking policy matching (weight: 5 points)
+        smoking_allowed = property_dict.get("smoking_allowed", False)
+        if tenant.is_smoker and smoking_allowed:
+            score += 5
+            reasons.append("Smoking allowed")
+        elif not tenant.is_smoker:
+            score += 2
+            reasons.append("No smoking restriction impact")
+        elif tenant.is_smoker and not smoking_allowed:
+            reasons.append("Smoking not allowed")
+
+        # Student friendly (weight: 5 points)
+        student_friendly = property_dict.get("student_friendly", True)
+        if tenant.is_student and student_friendly:
+            score += 5
+            reasons.append("学生友好")
+        elif not tenant.is_student:
+            score += 2
+            reasons.append("非学生无特殊限制")
+
+        # 房产类型偏好 (权重: 10分)
+        property_type = property_dict.get("property_type", "")
+        if property_type:
+            # 根据租客特征推断房产类型偏好
+            if tenant.is_student and property_type.lower() in [
+                "apartment",
+                "studio",
+            ]:
+                score += 10
+                reasons.append(f"适合学生的{property_type}")
+            elif tenant.num_occupants > 2 and property_type.lower() in [
+                "house",
+                "townhouse",
+            ]:
+                score += 10
+                reasons.append(f"适合多人居住的{property_type}")
+            elif property_type.lower() in ["apartment", "condo"]:
+                score += 5
+                reasons.append(f"常见房产类型: {property_type}")
+
+        # 额外设施加分
+        amenities = property_dict.get("amenities", [])
+        if amenities:
+            # Single pass over the list instead of one scan per amenity
+            found = SCORED_AMENITIES.intersection(amenities)
+            amenity_score = 0
+            if "parking" in found:
+                amenity_score += 2
+                reasons.append("包含停车位")
+            if "gym" in found or "fitness" in found:
+                amenity_score += 1
+                reasons.append("包含健身设施")
+            if "pool" in found:
+                amenity_score += 1
+                reasons.append("包含游泳池")
+            score += min(amenity_score, 5)  # Maximum 5 points for amenities
+
+        # Ensure score is within 0-100 range
+        score = max(0, min(100, score))
+
+        if not reasons:
+            reasons.append("Basic matching evaluation")
+
+        return score, reasons
+
+    except Exception as e:
+        logger.error(f"Error calculating matching score: {str(e)}")
+        return 0, ["Calculation error"]
+
 
 class GroupNegotiationService:
     """Group negotiation service - Manages matching and negotiation between multiple tenants and landlords"""
@@ -53,12 +200,70 @@ class GroupNegotiationService:
 
         # Active negotiation sessions - use ExtendedMetaState to store all session states
         self.active_negotiations: Dict[str, ExtendedMetaState] = {}
+        # Running negotiation tasks, kept outside the state to avoid task <-> state cycles
+        self._tasks: Dict[str, asyncio.Task] = {}
 
         # WebSocket manager for real-time communication
         self.websocket_manager = websocket_manager
 
+        # Cap on concurrently running negotiations (each one drives many LLM calls)
+        max_concurrent = (
+            config.agents.max_concurrent_negotiations
+            if config.agents and config.agents.max_concurrent_negotiations
+            else 8
+        )
+        self._negotiation_sem = asyncio.Semaphore(max_concurrent)
+
+        # Running aggregates so stats don't rescan every session
+        self._stats = {
+            "queued": 0,
+            "active": 0,
+            "completed": 0,
+            "cancelled": 0,
+            "error": 0,
+            "count": 0,
+            "score_sum": 0.0,
+            "messages": 0,
+        }
+
+        # Session ID generation - one random per-process prefix plus a monotonic counter
+        self._session_prefix = secrets.token_hex(4)
+        self._session_counter = itertools.count()
+
+    def generate_session_id(self, now_ns: Optional[int] = None) -> str:
+        """Generate a unique session ID without a urandom syscall per session
+
+        Args:
+            now_ns: Creation time from time.time_ns(), read here if not given
+        """
+        if now_ns is None:
+            now_ns = time.time_ns()
+        return f"session_{self._session_prefix}{next(self._session_counter):06x}_{now_ns // 1_000_000_000}"
+
+    async def _update_property(self, filter_query: dict, update_data: dict) -> bool:
+        """Update a property document off the event loop"""
+        return await asyncio.to_thread(
+            self.properties_db.update_document, filter_query, update_data
+        )
+
+    def ensure_indexes(self) -> None:
+        """Create the indexes used by matching queries (idempotent)"""
+        # Business keys used by the _get_*_by_id helpers and the landlord $lookup
+        self.tenants_db.collection.create_index("tenant_id", unique=True)
+        self.landlords_db.collection.create_index("landlord_id", unique=True)
+        self.properties_db.collection.create_index("property_id", unique=True)
+
+        # Availability filter at the head of the property matching pipeline
+        self.properties_db.collection.create_index(
+            [("rental_status.is_rented", 1), ("rental_status.is_occupied", 1)]
+        )
+
+        # Property lock/release updates filter properties by their landlord
+        self.properties_db.collection.create_index("landlord_id")
+        logger.info("MongoDB indexes ensured for negotiation queries")
+
     async def create_negotiation_session(
-        self, tenant: TenantModel, property_match: Dict[str, Any]
+        self, tenant: TenantModel, property_match: Dict[str, Any], negotiation_round: int = 1
     ) -> Dict[str, Any]:
         """
         Create a new negotiation session between tenant and property owner
@@ -66,20 +271,27 @@ class GroupNegotiationService:
         Args:
             tenant: The tenant model
             property_match: The matched property with score and reasons
+            negotiation_round: Global negotiation round the session belongs to
 
         Returns:
             Session metadata including ID and status
         """
         try:
-            # 1. Get property and landlord details
+            # 1. Get property and landlord details - reuse the documents joined during matching
             property_id = property_match.get("property_id")
-            property_data = await self._get_property_by_id(property_id)
+            if property_match.get("property"):
+                property_data = PropertyModel.model_validate(property_match["property"])
+            else:
+                property_data = await self._get_property_by_id(property_id)
             if not property_data:
                 logger.error(f"Cannot find property with ID {property_id}")
                 return None
 
             landlord_id = property_data.landlord_id
-            landlord = await self._get_landlord_by_id(landlord_id)
+            if property_match.get("landlord"):
+                landlord = LandlordModel.model_validate(property_match["landlord"])
+            else:
+                landlord = await self._get_landlord_by_id(landlord_id)
             if not landlord:
                 logger.error(f"Cannot find landlord with ID {landlord_id}")
                 return None
@@ -90,16 +302,17 @@ class GroupNegotiationService:
                 return None
             
             # Lock property, mark as under negotiation
-            self.properties_db.update_document(
+            await self._update_property(
                 {"landlord_id": landlord_id},
                 {"$set": {"rental_status": {"is_occupied": True}}}
             )
 
             # 2. Generate a unique session ID
-            session_id = f"session_{uuid.uuid4().hex[:8]}_{int(time.time())}"
+            # One clock read shared by the session ID and created_at
+            now_ns = time.time_ns()
+            session_id = self.generate_session_id(now_ns)
 
             # 3. Create initial state for meta controller
-            global NEGOTIATION_ROUND  # Ensure we use the global counter
             initial_state: ExtendedMetaState = {
                 "session_id": session_id,
                 "messages": [],
@@ -112,13 +325,15 @@ class GroupNegotiationService:
                 # Extended state
                 "match_score": property_match.get("score", 0),
                 "match_reasons": property_match.get("reasons", []),
-                "status": "active",
-                "created_at": datetime.now().isoformat(),
-                "negotiation_round": NEGOTIATION_ROUND
+                "status": "queued",
+                "created_at": datetime.fromtimestamp(now_ns / 1e9).isoformat(),
+                "negotiation_round": negotiation_round
             }
 
             # 4. Define message callback for logging and WebSocket communication
             async def message_callback(msg):
+                self._stats["messages"] += 1
+
                 # Detailed logging of conversation content
                 role = msg.get("role", "unknown")
                 active_agent = msg.get("active_agent", "unknown")
@@ -143,6 +358,10 @@ class GroupNegotiationService:
                 )
 
                 if self.websocket_manager:
+                    # Fast path: nobody is watching this session, skip building the event
+                    if not self.websocket_manager.has_listeners(session_id):
+                        return
+
                     websocket_message = {
                         "type": "message_sent",
                         "session_id": session_id,
@@ -160,7 +379,7 @@ class GroupNegotiationService:
                             session_id, websocket_message
                         )
                         logger.debug(
-                            f"✅ Sent WebSocket message for session {session_id}: {speaking_name}"
+                            "✅ Sent WebSocket message for session {}: {}", session_id, speaking_name
                         )
                     except Exception as ws_error:
                         logger.error(
@@ -174,49 +393,54 @@ class GroupNegotiationService:
             # 5. Define the actual negotiation coroutine
             async def run_negotiation():
                 try:
-                    async for msg in stream_conversation_with_state_update(
-                        initial_state=initial_state,
-                        callback_fn=message_callback,
-                        graph=meta_controller_graph,
-                    ):
-                        await asyncio.sleep(10)  # Simulate async delay
-                        pass
+                    # Bound how many LLM-driven negotiations run at once
+                    async with self._negotiation_sem:
+                        # Only report the session as active once it holds a negotiation slot
+                        self._set_session_status(initial_state, "active")
+
+                        async for msg in stream_conversation_with_state_update(
+                            initial_state=initial_state,
+                            callback_fn=message_callback,
+                            graph=meta_controller_graph,
+                        ):
+                            await asyncio.sleep(10)  # Simulate async delay
+                            pass
                     
-                    # 🚀 After negotiation completion, one-click analysis and update all states
-                    analysis_result_model = await self.analyze_and_update_rental_states(session_id)
-                    analysis_result_json = analysis_result_model.model_dump(mode='json') if hasattr(analysis_result_model, 'model_dump') else analysis_result_model
-                    logger.info(f"Session {session_id} analysis result: {analysis_result_json}")
-
-                    # 💾 Save conversation history to file
-                    await save_conversation_history(session_id, initial_state, analysis_result_json)
-
-                    # Send dialogue end event
-                    if self.websocket_manager:
-                        end_message = {
-                            "type": "dialogue_ended",
-                            "session_id": session_id,
-                            "reason": "completed",
-                            "negotiation_result": analysis_result_json,
-                            "timestamp": datetime.now().isoformat(),
-                        }
-                        await self.websocket_manager.send_message_to_session(
-                            session_id, end_message
+                        # 🚀 After negotiation completion, one-click analysis and update all states
+                        analysis_result_model = await self.analyze_and_update_rental_states(session_id)
+                        analysis_result_json = analysis_result_model.model_dump(mode='json') if hasattr(analysis_result_model, 'model_dump') else analysis_result_model
+                        logger.info(f"Session {session_id} analysis result: {analysis_result_json}")
+
+                        # 💾 Save conversation history to file
+                        await save_conversation_history(session_id, initial_state, analysis_result_json)
+
+                        # Send dialogue end event
+                        if self.websocket_manager and self.websocket_manager.has_listeners(session_id):
+                            end_message = {
+                                "type": "dialogue_ended",
+                                "session_id": session_id,
+                                "reason": "completed",
+                                "negotiation_result": analysis_result_json,
+                                "timestamp": now_iso(),
+                            }
+                            await self.websocket_manager.send_message_to_session(
+                                session_id, end_message
+                            )
+
+                        # Update status when complete
+                        self._set_session_status(initial_state, "completed")
+                        initial_state["analysis_result"] = analysis_result_json
+                        logger.info(
+                            f"Session {session_id} completed with {len(initial_state['messages'])} messages"
                         )
 
-                    # Update status when complete
-                    initial_state["status"] = "completed"
-                    initial_state["analysis_result"] = analysis_result_json
-                    logger.info(
-                        f"Session {session_id} completed with {len(initial_state['messages'])} messages"
-                    )
-
                 except asyncio.CancelledError:
                     logger.info(f"Session {session_id} was cancelled")
-                    initial_state["status"] = "cancelled"
+                    self._set_session_status(initial_state, "cancelled")
                     initial_state["termination_reason"] = "manually_cancelled"
                     
                     # Release property lock
-                    self.properties_db.update_document(
+                    await self._update_property(
                         {"property_id": property_id},
                         {"$set": {"rental_status": {"is_occupied": False}}}
                     )
@@ -227,11 +451,11 @@ class GroupNegotiationService:
 
                 except Exception as e:
                     logger.error(f"Error in session {session_id}: {str(e)}")
-                    initial_state["status"] = "error"
+                    self._set_session_status(initial_state, "error")
                     initial_state["termination_reason"] = f"Error: {str(e)}"
                     
                     # Release property lock
-                    self.properties_db.update_document(
+                    await self._update_property(
                         {"property_id": property_id},
                         {"$set": {"rental_status": {"is_occupied": False}}}
                     )
@@ -241,8 +465,12 @@ class GroupNegotiationService:
                         logger.error(f"Failed to save error conversation history: {str(save_error)}")
 
             # 6. Create and store the task
+            self._stats["queued"] += 1
+            self._stats["count"] += 1
+            self._stats["score_sum"] += initial_state["match_score"]
             task = asyncio.create_task(run_negotiation())
-            initial_state["task"] = task
+            self._tasks[session_id] = task
+            task.add_done_callback(lambda t, sid=session_id: self._tasks.pop(sid, None))
 
             # 7. Store in active negotiations
             self.active_negotiations[session_id] = initial_state
@@ -256,13 +484,52 @@ class GroupNegotiationService:
                 "monthly_rent": property_data.monthly_rent,
                 "match_score": property_match.get("score", 0),
                 "match_reasons": property_match.get("reasons", [])[:3],  # Top 3 reasons
-                "status": "active",
+                "status": initial_state["status"],
                 "created_at": initial_state["created_at"],
             }
         except Exception as e:
             logger.error(f"Failed to create negotiation session: {str(e)}")
             return None
 
+    async def iter_negotiation_sessions(
+        self, tenants: List[TenantModel], negotiation_round: int
+    ) -> AsyncIterator[Tuple[TenantModel, Dict[str, Any]]]:
+        """
+        Match and start a negotiation for each tenant, yielding sessions as they are created
+
+        Callers can push progress for each session immediately instead of waiting
+        for the whole batch. Close the generator explicitly (``await gen.aclose()``)
+        when stopping early so it is not left for deferred finalization.
+
+        Args:
+            tenants: Tenants that should start a negotiation
+            negotiation_round: Current global negotiation round
+
+        Yields:
+            The tenant and its session metadata (status "error" if creation failed)
+        """
+        for tenant in tenants:
+            best_match = await self.find_best_property_for_tenant(tenant.tenant_id)
+            if not best_match:
+                logger.warning(f"No suitable property found for tenant {tenant.name}, skipping session creation")
+                continue
+
+            session_data = await self.create_negotiation_session(tenant, best_match, negotiation_round)
+            if not session_data:
+                logger.error(f"Failed to create negotiation session for tenant {tenant.name}")
+                now_ns = time.time_ns()
+                session_data = {
+                    "session_id": self.generate_session_id(now_ns),
+                    "tenant_name": tenant.name,
+                    "landlord_name": best_match.get("landlord_name", "unknown landlord"),
+                    "property_address": best_match.get("display_address", "Unknown Address"),
+                    "status": "error",
+                    "created_at": datetime.fromtimestamp(now_ns / 1e9).isoformat(),
+                    "negotiation_round": negotiation_round,
+                }
+
+            yield tenant, session_data
+
     async def find_best_property_for_tenant(
         self, tenant_id: str
     ) -> Optional[Dict[str, Any]]:
@@ -282,214 +549,218 @@ class GroupNegotiationService:
                 logger.error(f"Cannot find tenant: {tenant_id}")
                 return None
 
-            # Get all available properties
-            all_properties = await self._get_all_unrented_unoccupied_properties()
-            if not all_properties:
+            # Score every available property server-side and keep only the best one
+            ranked = await asyncio.to_thread(
+                self.properties_db.aggregate,
+                self._build_property_match_pipeline(tenant),
+            )
+            if not ranked:
                 logger.error("没有可用房产")
                 return None
 
-            def calculate_property_match_score(
-                tenant: TenantModel, property_dict: Dict[str, Any]
-            ) -> tuple[float, List[str]]:
-                """
-                Calculate matching score between tenant and property
+            # Tenant-derived scoring constants, computed once per tenant
+            pref_set = frozenset(
+                loc.lower() for loc in tenant.preferred_locations if isinstance(loc, str)
+            )
+            budget_80 = tenant.max_budget * 0.8
+            min_bed, max_bed = tenant.min_bedrooms, tenant.max_bedrooms
+
+            # The pipeline returns the full winning document joined with its landlord
+            winner = ranked[0]
+            landlord_docs = winner.pop("_landlord", [])
+            landlord_dict = landlord_docs[0] if landlord_docs else None
+            if landlord_dict:
+                landlord_dict.pop("_id", None)
+            property_model = PropertyModel.model_validate(winner)
+            property_dict = property_model.to_dict()
+            property_dict["monthly_rent"] = property_model.monthly_rent
+            best_score, reasons = calculate_property_match_score(
+                tenant, property_dict, pref_set, budget_80, min_bed, max_bed
+            )
+            if best_score <= 0:
+                logger.warning(f"未找到适合租客 {tenant.name} 的房产")
+                return None
 
-                Args:
-                    tenant: Tenant model
-                    property_dict: Property information dictionary
+            best_match = {
+                "property_id": property_dict.get("property_id"),
+                "property": property_dict,
+                "score": best_score,
+                "reasons": reasons,
+                "landlord_id": property_dict.get("landlord_id"),
+                "landlord": landlord_dict,
+                "landlord_name": (landlord_dict or {}).get("name", "未知房东"),
+                "monthly_rent": property_dict.get("price", 0),
+                "display_address": property_dict.get(
+                    "display_address", "未知地址"
+                ),
+            }
 
-                Returns:
-                    Matching score (0-100) and list of matching reasons
-                """
-                score = 0
-                reasons = []
+            logger.info(
+                f"为租客 {tenant.name} 找到最佳匹配房产: {best_match['property_id']} (分数: {best_score})"
+            )
+            return best_match
 
-                try:
-                    # Budget matching (weight: 30 points)
-                    monthly_rent = property_dict.get("monthly_rent", 0)
-                    if monthly_rent <= tenant.max_budget:
-                        budget_ratio = (
-                            monthly_rent / tenant.max_budget
-                            if tenant.max_budget > 0
-                            else 0
-                        )
-                        if budget_ratio <= 0.8:  # 租金不超过预算80%
-                            score += 30
-                            reasons.append(f"租金 ${monthly_rent} 在预算范围内")
-                        elif budget_ratio <= 1.0:  # 租金在预算范围内但较高
-                            score += 20
-                            reasons.append(f"Rent ${monthly_rent} is close to budget limit")
-                    else:
-                        reasons.append(
-                            f"Rent ${monthly_rent} exceeds budget ${tenant.max_budget}"
-                        )
+        except Exception as e:
+            logger.error(f"为租客 {tenant_id} 匹配房产时出错: {str(e)}")
+            return None
 
-                    # Bedroom count matching (weight: 20 points)
-                    bedrooms = property_dict.get("bedrooms", 0)
-                    if tenant.min_bedrooms <= bedrooms <= tenant.max_bedrooms:
-                        score += 20
-                        reasons.append(f"{bedrooms} bedroom(s) meets requirements")
-                    elif (
-                        bedrooms == tenant.min_bedrooms - 1
-                        or bedrooms == tenant.max_bedrooms + 1
-                    ):
-                        score += 10
-                        reasons.append(f"{bedrooms} bedroom(s) close to requirements")
-                    else:
-                        reasons.append(
-                            f"{bedrooms} bedroom(s) doesn't match requirements({tenant.min_bedrooms}-{tenant.max_bedrooms} bedrooms)"
-                        )
+    def _build_property_match_pipeline(self, tenant: TenantModel) -> List[Dict[str, Any]]:
+        """
+        Build the aggregation pipeline that ranks available properties for a tenant
 
-                    # Geographic location matching (weight: 20 points)
-                    property_location = property_dict.get("district", "").lower()
-                    if property_location and tenant.preferred_locations:
-                        preferred_lower = [
-                            loc.lower() for loc in tenant.preferred_locations
-                        ]
-                        if property_location in preferred_lower:
-                            score += 20
-                            reasons.append(f"Located in preferred area: {property_location}")
-                        elif any(pref in property_location for pref in preferred_lower):
-                            score += 10
-                            reasons.append(f"Located in related area: {property_location}")
-
-                    # Pet policy matching (weight: 10 points)
-                    pets_allowed = property_dict.get("pets_allowed", False)
-                    if tenant.has_pets and pets_allowed:
-                        score += 10
-                        reasons.append("Pets allowed")
-                    elif not tenant.has_pets:
-                        score += 5
-                        reasons.append("No pet restriction impact")
-                    elif tenant.has_pets and not pets_allowed:
-                        reasons.append("Pets not allowed")
-
-                    # Smoking policy matching (weight: 5 points)
-                    smoking_allowed = property_dict.get("smoking_allowed", False)
-                    if tenant.is_smoker and smoking_allowed:
-                        score += 5
-                        reasons.append("Smoking allowed")
-                    elif not tenant.is_smoker:
-                        score += 2
-                        reasons.append("No smoking restriction impact")
-                    elif tenant.is_smoker and not smoking_allowed:
-                        reasons.append("Smoking not allowed")
-
-                    # Student friendly (weight: 5 points)
-                    student_friendly = property_dict.get("student_friendly", True)
-                    if tenant.is_student and student_friendly:
-                        score += 5
-                        reasons.append("学生友好")
-                    elif not tenant.is_student:
-                        score += 2
-                        reasons.append("非学生无特殊限制")
-
-                    # 房产类型偏好 (权重: 10分)
-                    property_type = property_dict.get("property_type", "")
-                    if property_type:
-                        # 根据租客特征推断房产类型偏好
-                        if tenant.is_student and property_type.lower() in [
-                            "apartment",
-                            "studio",
-                        ]:
-                            score += 10
-                            reasons.append(f"适合学生的{property_type}")
-                        elif tenant.num_occupants > 2 and property_type.lower() in [
-                            "house",
-                            "townhouse",
-                        ]:
-                            score += 10
-                            reasons.append(f"适合多人居住的{property_type}")
-                        elif property_type.lower() in ["apartment", "condo"]:
-                            score += 5
-                            reasons.append(f"常见房产类型: {property_type}")
-
-                    # 额外设施加分
-                    amenities = property_dict.get("amenities", [])
-                    if amenities:
-                        amenity_score = 0
-                        if "parking" in amenities:
-                            amenity_score += 2
-                            reasons.append("包含停车位")
-                        if "gym" in amenities or "fitness" in amenities:
-                            amenity_score += 1
-                            reasons.append("包含健身设施")
-                        if "pool" in amenities:
-                            amenity_score += 1
-                            reasons.append("包含游泳池")
-                        score += min(amenity_score, 5)  # Maximum 5 points for amenities
-
-                    # Ensure score is within 0-100 range
-                    score = max(0, min(100, score))
-
-                    if not reasons:
-                        reasons.append("Basic matching evaluation")
-
-                    return score, reasons
+        The $cond weights mirror calculate_property_match_score so the winner picked
+        by MongoDB gets the same score when its reasons are rebuilt in Python.
+        Properties within budget always rank first, falling back to the whole pool.
+        """
+        budget = tenant.max_budget
+        rent = "$_monthly_rent"
+        bedrooms = {"$ifNull": ["$bedrooms", 0]}
+
+        # Budget matching (weight: 30 points)
+        budget_score = {
+            "$cond": [
+                {"$lte": [rent, budget * 0.8]},
+                30,
+                {"$cond": [{"$lte": [rent, budget]}, 20, 0]},
+            ]
+        }
 
-                except Exception as e:
-                    logger.error(f"Error calculating matching score: {str(e)}")
-                    return 0, ["Calculation error"]
-
-            # First filter properties within budget range
-            budget_properties = []
-            for property_model in all_properties:
-                property_dict = property_model.to_dict()
-                monthly_rent = property_dict.get("monthly_rent", 0)
-                if monthly_rent <= tenant.max_budget:
-                    budget_properties.append(property_model)
-
-            if not budget_properties:
-                logger.warning("未找到预算范围内的房产，尝试在所有房产中匹配")
-                budget_properties = all_properties
-
-            best_match = None
-            best_score = 0
-
-            for property_model in budget_properties:
-                property_dict = property_model.to_dict()
-                score, reasons = calculate_property_match_score(tenant, property_dict)
-
-                if score > best_score:
-                    best_score = score
-                    property_dict = await self._get_property_by_id(
-                        property_dict["property_id"]
-                    )
-                    property_dict = property_dict.to_dict()
-                    best_match = {
-                        "property_id": property_dict.get("property_id"),
-                        "property": property_dict,
-                        "score": score,
-                        "reasons": reasons,
-                        "landlord_id": property_dict.get("landlord_id"),
-                        "landlord_name": property_dict.get("landlord_name", "未知房东"),
-                        "monthly_rent": property_dict.get("price", 0),
-                        "display_address": property_dict.get(
-                            "display_address", "未知地址"
-                        ),
-                    }
+        # Bedroom count matching (weight: 20 points)
+        bedroom_score = {
+            "$cond": [
+                {"$and": [
+                    {"$gte": [bedrooms, tenant.min_bedrooms]},
+                    {"$lte": [bedrooms, tenant.max_bedrooms]},
+                ]},
+                20,
+                {"$cond": [
+                    {"$in": [bedrooms, [tenant.min_bedrooms - 1, tenant.max_bedrooms + 1]]},
+                    10,
+                    0,
+                ]},
+            ]
+        }
 
-            if best_match:
-                logger.info(
-                    f"为租客 {tenant.name} 找到最佳匹配房产: {best_match['property_id']} (分数: {best_score})"
-                )
-                
-                return best_match
-            else:
-                logger.warning(f"未找到适合租客 {tenant.name} 的房产")
-                return None
+        # Geographic location matching (weight: 20 points) - only named areas can match
+        preferred_lower = [
+            loc.lower() for loc in tenant.preferred_locations if isinstance(loc, str)
+        ]
+        district = {"$toLower": {"$ifNull": ["$district", ""]}}
+        if preferred_lower:
+            location_score = {
+                "$cond": [
+                    {"$eq": [district, ""]},
+                    0,
+                    {"$cond": [
+                        {"$in": [district, preferred_lower]},
+                        20,
+                        {"$cond": [
+                            {"$or": [
+                                {"$gte": [{"$indexOfCP": [district, pref]}, 0]}
+                                for pref in preferred_lower
+                            ]},
+                            10,
+                            0,
+                        ]},
+                    ]},
+                ]
+            }
+        else:
+            location_score = 0
+
+        # Pet policy (10 points), smoking policy (5 points), student friendly (5 points)
+        pets_allowed = {"$ifNull": ["$pets_allowed", False]}
+        smoking_allowed = {"$ifNull": ["$smoking_allowed", False]}
+        student_friendly = {"$ifNull": ["$student_friendly", True]}
+        pet_score = {"$cond": [pets_allowed, 10, 0]} if tenant.has_pets else 5
+        smoking_score = {"$cond": [smoking_allowed, 5, 0]} if tenant.is_smoker else 2
+        student_score = {"$cond": [student_friendly, 5, 0]} if tenant.is_student else 2
+
+        # Property type preference (weight: 10 points)
+        property_type = {"$toLower": {"$ifNull": ["$property_type", ""]}}
+        type_branches = []
+        if tenant.is_student:
+            type_branches.append({"case": {"$in": [property_type, ["apartment", "studio"]]}, "then": 10})
+        if tenant.num_occupants > 2:
+            type_branches.append({"case": {"$in": [property_type, ["house", "townhouse"]]}, "then": 10})
+        type_branches.append({"case": {"$in": [property_type, ["apartment", "condo"]]}, "then": 5})
+        type_score = {"$switch": {"branches": type_branches, "default": 0}}
+
+        # Amenity bonus (max 5 points)
+        # Intersect once with the scored set, then test membership on the small result
+        found = "$$found"
+        amenity_score = {
+            "$let": {
+                "vars": {"found": {"$setIntersection": [
+                    {"$ifNull": ["$amenities", []]}, sorted(SCORED_AMENITIES)
+                ]}},
+                "in": {"$min": [
+                    5,
+                    {"$add": [
+                        {"$cond": [{"$in": ["parking", found]}, 2, 0]},
+                        {"$cond": [{"$or": [
+                            {"$in": ["gym", found]},
+                            {"$in": ["fitness", found]},
+                        ]}, 1, 0]},
+                        {"$cond": [{"$in": ["pool", found]}, 1, 0]},
+                    ]},
+                ]},
+            }
+        }
 
-        except Exception as e:
-            logger.error(f"为租客 {tenant_id} 匹配房产时出错: {str(e)}")
-            return None
+        return [
+            {"$match": {"rental_status.is_rented": False, "rental_status.is_occupied": False}},
+            # Same conversion as PropertyModel.monthly_rent
+            {"$addFields": {
+                "_monthly_rent": {
+                    "$switch": {
+                        "branches": [
+                            {"case": {"$eq": ["$price.frequency", "weekly"]},
+                             "then": {"$divide": [{"$multiply": ["$price.amount", 52]}, 12]}},
+                            {"case": {"$eq": ["$price.frequency", "yearly"]},
+                             "then": {"$divide": ["$price.amount", 12]}},
+                        ],
+                        "default": {"$ifNull": ["$price.amount", 0]},
+                    }
+                }
+            }},
+            {"$addFields": {
+                "_in_budget": {"$lte": [rent, budget]},
+                "_match_score": {
+                    "$max": [0, {"$min": [100, {"$add": [
+                        budget_score,
+                        bedroom_score,
+                        location_score,
+                        pet_score,
+                        smoking_score,
+                        student_score,
+                        type_score,
+                        amenity_score,
+                    ]}]}]
+                },
+            }},
+            {"$sort": {"_in_budget": -1, "_match_score": -1, "_id": 1}},
+            {"$limit": 1},
+            # Join the owning landlord so session creation needs no further lookups
+            {"$lookup": {
+                "from": self.landlords_db.collection_name,
+                "localField": "landlord_id",
+                "foreignField": "landlord_id",
+                "as": "_landlord",
+            }},
+            {"$project": {"_id": 0, "_monthly_rent": 0, "_in_budget": 0, "_match_score": 0}},
+        ]
 
     async def get_session_info(self, session_id: str) -> Optional[Dict[str, Any]]:
         """获取协商会话信息"""
         session = self.active_negotiations.get(session_id)
         if not session:
             return None
+        return self.format_session_info(session)
 
-        # 转换为前端友好的格式
+    @staticmethod
+    def format_session_info(session: ExtendedMetaState) -> Dict[str, Any]:
+        """转换为前端友好的格式"""
         tenant_data = session.get("tenant_data", {})
         landlord_data = session.get("landlord_data", {})
         property_data = session.get("property_data", {})
@@ -511,67 +782,74 @@ class GroupNegotiationService:
 
     async def get_all_active_sessions(self) -> List[Dict[str, Any]]:
         """获取所有活跃的协商会话"""
-        formatted_sessions = []
-        for session_id in self.active_negotiations:
-            session_info = await self.get_session_info(session_id)
-            if session_info:
-                formatted_sessions.append(session_info)
-        return formatted_sessions
+        return [self.format_session_info(session) for session in self.active_negotiations.values()]
+
+    def _set_session_status(self, session: Dict[str, Any], status: str) -> None:
+        """更新会话状态并同步统计计数"""
+        self._stats[session["status"]] -= 1
+        session["status"] = status
+        self._stats[status] += 1
 
     def get_negotiation_stats(self) -> Dict[str, Any]:
         """获取协商统计信息"""
-        active_count = len(
-            [s for s in self.active_negotiations.values() if s["status"] == "active"]
-        )
-        completed_count = len(
-            [s for s in self.active_negotiations.values() if s["status"] == "completed"]
-        )
-
-        if not self.active_negotiations:
-            return {"active_sessions": 0, "completed_sessions": 0}
-
-        # 计算平均消息数
-        total_messages = sum(
-            len(session["messages"]) for session in self.active_negotiations.values()
-        )
-        avg_messages = (
-            total_messages / len(self.active_negotiations)
-            if self.active_negotiations
-            else 0
-        )
-
-        # 计算平均匹配分数
-        total_score = sum(
-            session["match_score"] for session in self.active_negotiations.values()
-        )
-        avg_score = (
-            total_score / len(self.active_negotiations)
-            if self.active_negotiations
-            else 0
-        )
+        stats = self._stats
+        if not stats["count"]:
+            return {"queued_sessions": 0, "active_sessions": 0, "completed_sessions": 0}
 
         return {
-            "active_sessions": active_count,
-            "completed_sessions": completed_count,
-            "total_sessions": len(self.active_negotiations),
-            "total_messages": total_messages,
-            "average_messages_per_session": round(avg_messages, 2),
-            "average_match_score": round(avg_score, 2),
+            "queued_sessions": stats["queued"],
+            "active_sessions": stats["active"],
+            "completed_sessions": stats["completed"],
+            "total_sessions": stats["count"],
+            "total_messages": stats["messages"],
+            "average_messages_per_session": round(stats["messages"] / stats["count"], 2),
+            "average_match_score": round(stats["score_sum"] / stats["count"], 2),
         }
 
     async def _get_tenant_by_id(self, tenant_id: str) -> Optional[TenantModel]:
         """根据ID获取租客信息"""
         try:
-            results = self.tenants_db.fetch_documents(1, {"tenant_id": tenant_id})
+            results = await asyncio.to_thread(
+                self.tenants_db.fetch_documents, 1, {"tenant_id": tenant_id}
+            )
             return results[0] if results else None
         except Exception as e:
             logger.error(f"获取租客失败: {str(e)}")
             return None
 
+    async def _has_tenants_and_landlords(self) -> bool:
+        """检查租客和房东数据是否已初始化（只探测单个文档，不加载整个集合）"""
+        def probe() -> bool:
+            return (
+                self.tenants_db.collection.find_one({}, {"_id": 1}) is not None
+                and self.landlords_db.collection.find_one({}, {"_id": 1}) is not None
+            )
+
+        try:
+            return await asyncio.to_thread(probe)
+        except Exception as e:
+            logger.error(f"检查初始化数据失败: {str(e)}")
+            return False
+
+    async def _get_tenants_by_ids(self, tenant_ids: List[str]) -> Dict[str, TenantModel]:
+        """根据ID列表批量获取租客信息（单次查询），按 tenant_id 索引"""
+        if not tenant_ids:
+            return {}
+        try:
+            results = await asyncio.to_thread(
+                self.tenants_db.fetch_documents, 0, {"tenant_id": {"$in": list(tenant_ids)}}
+            )
+            return {tenant.tenant_id: tenant for tenant in results}
+        except Exception as e:
+            logger.error(f"批量获取租客失败: {str(e)}")
+            return {}
+
     async def _get_landlord_by_id(self, landlord_id: str) -> Optional[LandlordModel]:
         """根据ID获取房东信息"""
         try:
-            results = self.landlords_db.fetch_documents(1, {"landlord_id": landlord_id})
+            results = await asyncio.to_thread(
+                self.landlords_db.fetch_documents, 1, {"landlord_id": landlord_id}
+            )
             return results[0] if results else None
         except Exception as e:
             logger.error(f"获取房东失败: {str(e)}")
@@ -580,8 +858,8 @@ class GroupNegotiationService:
     async def _get_property_by_id(self, property_id: str) -> Optional[PropertyModel]:
         """根据ID获取房产信息"""
         try:
-            results = self.properties_db.fetch_documents(
-                1, {"property_id": property_id}
+            results = await asyncio.to_thread(
+                self.properties_db.fetch_documents, 1, {"property_id": property_id}
             )
             return results[0] if results else None
         except Exception as e:
@@ -591,7 +869,9 @@ class GroupNegotiationService:
     async def _get_all_tenants(self, limit: int = 0) -> List[TenantModel]:
         """获取所有租客"""
         try:
-            results = self.tenants_db.fetch_documents(limit, {})
+            results = await asyncio.to_thread(
+                self.tenants_db.fetch_documents, limit, {}
+            )
             return results  # MongoDB client now returns Pydantic models directly
         except Exception as e:
             logger.error(f"获取租客失败: {str(e)}")
@@ -600,7 +880,9 @@ class GroupNegotiationService:
     async def _get_all_landlords(self) -> List[LandlordModel]:
         """获取所有房东"""
         try:
-            results = self.landlords_db.fetch_documents(0, {})  # 0 means no limit
+            results = await asyncio.to_thread(
+                self.landlords_db.fetch_documents, 0, {}  # 0 means no limit
+            )
             return results  # MongoDB client now returns Pydantic models directly
         except Exception as e:
             logger.error(f"获取房东失败: {str(e)}")
@@ -609,7 +891,9 @@ class GroupNegotiationService:
     async def _get_all_properties(self) -> List[PropertyModel]:
         """获取所有房产"""
         try:
-            results = self.properties_db.fetch_documents(0, {})  # 0 means no limit
+            results = await asyncio.to_thread(
+                self.properties_db.fetch_documents, 0, {}  # 0 means no limit
+            )
             return results  # MongoDB client now returns Pydantic models directly
         except Exception as e:
             logger.error(f"获取房产失败: {str(e)}")
@@ -618,8 +902,8 @@ class GroupNegotiationService:
     async def _get_all_unrented_properties(self) -> List[PropertyModel]:
         """获取所有未租赁的房产"""
         try:
-            results = self.properties_db.fetch_documents(
-                0, {"rental_status.is_rented": False}
+            results = await asyncio.to_thread(
+                self.properties_db.fetch_documents, 0, {"rental_status.is_rented": False}
             )
             logger.info(f"获取未租赁房产数量: {len(results)}")
             return results  # MongoDB client now returns Pydantic models directly
@@ -630,8 +914,10 @@ class GroupNegotiationService:
     async def _get_all_unrented_unoccupied_properties(self) -> List[PropertyModel]:
         """获取所有未租赁且未被占用的房产"""
         try:
-            results = self.properties_db.fetch_documents(
-                0, {"rental_status.is_rented": False, "rental_status.is_occupied": False}
+            results = await asyncio.to_thread(
+                self.properties_db.fetch_documents,
+                0,
+                {"rental_status.is_rented": False, "rental_status.is_occupied": False},
             )
             logger.info(f"获取未租赁且未被占用房产数量: {len(results)}")
             return results  # MongoDB client now returns Pydantic models directly
@@ -676,15 +962,8 @@ class GroupNegotiationService:
                 "conversation": conversation_text,
             }
             
-            # Configure LLM
-            llm_config = config.llm.get("default", {})
-            llm = ChatOpenAI(
-                api_key=llm_config.api_key,
-                model=llm_config.model,
-                base_url=llm_config.base_url,
-                temperature=llm_config.temperature,
-                max_tokens=llm_config.max_tokens,
-            )
+            # Shared LLM client (keeps its connection pool across sessions)
+            llm = get_default_llm()
             
             # Generate the rendered prompt content
             prompt_content = MARKET_ANALYSIS_PROMPT.get_prompt(**context)
@@ -744,7 +1023,8 @@ class GroupNegotiationService:
             if tenant_id:
                 try:
                     tenant_status_json = result.tenant_rental_status.model_dump()
-                    self.tenants_db.update_document(
+                    await asyncio.to_thread(
+                        self.tenants_db.update_document,
                         {"tenant_id": tenant_id},
                         {"$set": {"rental_status": tenant_status_json}},
                     )
@@ -760,7 +1040,7 @@ class GroupNegotiationService:
             if property_id:
                 try:
                     property_status_json = result.property_rental_status.model_dump()
-                    self.properties_db.update_document(
+                    await self._update_property(
                         {"property_id": property_id},
                         {"$set": {"rental_status": property_status_json}},
                     )
@@ -776,7 +1056,8 @@ class GroupNegotiationService:
             if landlord_id:
                 try:
                     landlord_stats_json = result.landlord_rental_status.model_dump()
-                    self.landlords_db.update_document(
+                    await asyncio.to_thread(
+                        self.landlords_db.update_document,
                         {"landlord_id": landlord_id},
                         {"$set": {"rental_stats": landlord_stats_json}},
                     )
@@ -4,52 +4,83 @@ Focused on implementing core functionality for tenant-landlord search and negoti
 """
 from contextlib import asynccontextmanager
 import asyncio
-from datetime import datetime
-import json
-import uuid
-import time
+import threading
 import random
 from typing import List
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Query
+import numpy as np
+import orjson
+import ormsgpack
+from fastapi import BackgroundTasks, FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from opik.integrations.langchain import OpikTracer
 from loguru import logger
 from pydantic import BaseModel
 
 from app.conversation_service.reset_conversation import reset_conversation_state
 from app.utils.opik_utils import configure
+from app.utils.clock import now_iso
 from app.mongo import initialize_database
 from app.config import config
 from app.api_service.models import StartNegotiationRequest, InitializeRequest
 
 from .group_negotiation import GroupNegotiationService
-from .websocket import ConnectionManager
+from .websocket import (
+    MAX_INBOUND_FRAME_BYTES,
+    ConnectionManager,
+    PayloadTooLargeError,
+    encode_binary,
+    encode_message,
+)
 from app.agents.agents_factory import AgentDataInitializer
 from app.data_analysis.market_analyzer_api import analysis_router
 from app.config import NEGOTIATION_ROUND
 
-configure()
+# Seconds shutdown waits for pending Opik traces before giving up on them
+OPIK_FLUSH_TIMEOUT = 3.0
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Handle application startup and shutdown events"""
     logger.info("Starting Multi-Agent Communication API")
 
+    # Configure Opik once per process at startup; it may call out to the Opik API,
+    # so keep it off the event loop and out of module import
+    await asyncio.to_thread(configure)
+
     # Initialize database
     await initialize_database()
+    # Collections are recreated above, so indexes must be (re)built afterwards
+    await asyncio.to_thread(group_service.ensure_indexes)
+
+    status_task = asyncio.create_task(_broadcast_connection_status())
+    ping_task = asyncio.create_task(_broadcast_server_ping())
 
     yield
     logger.info("Shutting down Multi-Agent Communication API")
-    opik_tracer = OpikTracer()
-    opik_tracer.flush()
+    status_task.cancel()
+    ping_task.cancel()
+    # Only flush traces when Opik monitoring is configured. Building the tracer and
+    # flushing both may do network I/O, so run them together in a daemon thread and
+    # bound the wait: the thread can be abandoned without blocking exit
+    if config.opik:
+        flush_thread = threading.Thread(target=lambda: OpikTracer().flush(), name="opik-flush", daemon=True)
+        flush_thread.start()
+        await asyncio.to_thread(flush_thread.join, OPIK_FLUSH_TIMEOUT)
+        if flush_thread.is_alive():
+            logger.warning(f"Opik trace flush did not finish within {OPIK_FLUSH_TIMEOUT}s, skipping")
+    # Drain the enqueued log sink before the process exits
+    await logger.complete()
 
 # Create FastAPI application
 app = FastAPI(
     title="Multi-Agent Communication API",
     description="Intelligent negotiation system between tenants and landlords",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -71,31 +102,43 @@ app.include_router(analysis_router)
 group_service = GroupNegotiationService(websocket_manager=manager)
 
 
+# Static body for the root endpoint, encoded once at import
+_ROOT_RESPONSE_BODY = encode_message({
+    "name": "Multi-Agent Communication API",
+    "version": "1.0.0",
+    "description": "Intelligent system for tenant-landlord search and negotiation",
+    "features": [
+        "Intelligent tenant-landlord matching",
+        "Real-time negotiation dialogue",
+        "Group negotiation management",
+        "WebSocket real-time communication",
+        "LangGraph streaming Agent controller"
+    ]
+}).encode()
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
-    return {
-        "name": "Multi-Agent Communication API",
-        "version": "1.0.0",
-        "description": "Intelligent system for tenant-landlord search and negotiation",
-        "features": [
-            "Intelligent tenant-landlord matching",
-            "Real-time negotiation dialogue",
-            "Group negotiation management",
-            "WebSocket real-time communication",
-            "LangGraph streaming Agent controller"
-        ]
-    }
+    return Response(content=_ROOT_RESPONSE_BODY, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now_iso(),
         "service": "rental-agent-backend"
     }
 
+# Frontend configuration is fixed for the life of the process, so encode it once
+_CONFIG_RESPONSE_BODY = (
+    encode_message({"google_maps_api_key": config.google_maps.api_key}).encode()
+    if config.google_maps and config.google_maps.api_key
+    else None
+)
+
+
 @app.get("/config")
 async def get_config():
     """
@@ -104,17 +147,45 @@ async def get_config():
     Returns:
         dict: Configuration information including Google Maps API key
     """
-    try:
-        if not config.google_maps or not config.google_maps.api_key:
-            raise HTTPException(status_code=500, detail="Google Maps API key not configured")
-        
-        return {
-            "google_maps_api_key": config.google_maps.api_key
-        }
-    except Exception as e:
-        logger.error(f"Failed to get configuration: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to get configuration: {str(e)}")
+    if _CONFIG_RESPONSE_BODY is None:
+        logger.error("Failed to get configuration: Google Maps API key not configured")
+        raise HTTPException(status_code=500, detail="Google Maps API key not configured")
+    return Response(content=_CONFIG_RESPONSE_BODY, media_type="application/json")
+
+
 
+# Monthly rent shown on the map when a property has no usable price
+DEFAULT_MONTHLY_RENT = 2000
+
+
+def _price_amount(prop: dict) -> float:
+    """Return the raw price amount of a property, or NaN if it has no usable price"""
+    price_info = prop.get("price", {})
+    if not isinstance(price_info, dict) or not price_info:
+        return np.nan
+    try:
+        return float(price_info.get("amount", 0))
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid price amount for property {prop.get('property_id', 'unknown')}")
+        return np.nan
+
+
+def _monthly_rents(properties: List[dict]) -> List[int]:
+    """Convert property prices to whole monthly rents in one vectorized pass"""
+    if not properties:
+        return []
+    amounts = np.fromiter((_price_amount(prop) for prop in properties), dtype=float, count=len(properties))
+    frequencies = np.array([
+        price.get("frequency", "monthly") if isinstance(price := prop.get("price"), dict) else "monthly"
+        for prop in properties
+    ])
+    monthly = np.where(
+        frequencies == "weekly", amounts * 52 / 12,
+        np.where(frequencies == "yearly", amounts / 12, amounts),
+    )
+    # Truncate like int(), and fall back to the default where the price was unusable
+    monthly = np.where(np.isnan(monthly), DEFAULT_MONTHLY_RENT, np.trunc(monthly))
+    return monthly.astype(int).tolist()
 
 
 @app.post("/initialize")
@@ -139,14 +210,10 @@ async def initialize_system(request: InitializeRequest):
         await agent_factory.clear_all_data()
         logger.info("Cleared existing data")
         
-        # Check if data already exists
-        existing_properties = await agent_factory.get_properties_count()
-        existing_landlords = await agent_factory.get_landlords_count()
-        
-        # If no property and landlord data, initialize basic data first
-        if existing_properties == 0 or existing_landlords == 0:
-            logger.info("Initializing property and landlord data...")
-            await agent_factory.initialize_properties_and_landlords()
+        # The collections were just emptied (clear_all_data raises otherwise), so the
+        # property and landlord data always needs loading - no need to count documents
+        logger.info("Initializing property and landlord data...")
+        await agent_factory.initialize_properties_and_landlords()
         
         # Generate specified number of tenants
         logger.info(f"Generating {request.tenant_count} tenants...")
@@ -157,30 +224,9 @@ async def initialize_system(request: InitializeRequest):
         landlords = await agent_factory.get_all_landlords()
         
         # Prepare map data
-        map_data = []
-        for prop in properties:
-            # Safely get monthly rent
-            try:
-                # If there's a price field, manually calculate monthly rent
-                price_info = prop.get("price", {})
-                if isinstance(price_info, dict) and price_info:
-                    amount = price_info.get("amount", 0)
-                    frequency = price_info.get("frequency", "monthly")
-                    
-                    if frequency == 'weekly':
-                        monthly_rent = int(amount * 52 / 12)
-                    elif frequency == 'yearly':
-                        monthly_rent = int(amount / 12)
-                    else:
-                        monthly_rent = int(amount)
-                else:
-                    # If no price field, use default value
-                    monthly_rent = 2000
-            except Exception as e:
-                logger.warning(f"Error calculating monthly rent for property {prop.get('property_id', 'unknown')}: {e}")
-                monthly_rent = 2000
-            
-            map_data.append({
+        monthly_rents = _monthly_rents(properties)
+        map_data = [
+            {
                 "id": prop.get("property_id", "unknown"),
                 "latitude": prop.get("location", {}).get("latitude", 51.5074),
                 "longitude": prop.get("location", {}).get("longitude", -0.1278),
@@ -189,7 +235,9 @@ async def initialize_system(request: InitializeRequest):
                 "bedrooms": prop.get("bedrooms", 1),
                 "property_type": prop.get("property_sub_type", "Unknown"),
                 "landlord_id": prop.get("landlord_id", "unknown")
-            })
+            }
+            for prop, monthly_rent in zip(properties, monthly_rents)
+        ]
         
         result = {
             "message": "System initialization successful",
@@ -204,9 +252,13 @@ async def initialize_system(request: InitializeRequest):
             },
             "status": "initialized"
         }
+        # ORJSONResponse renders its body on construction: build it in a worker thread so the
+        # (potentially multi-MB) serialization stays off the event loop, and before returning
+        # so a serialization failure still becomes a 500 rather than a truncated body
+        response = await asyncio.to_thread(ORJSONResponse, result)
         
         logger.info(f"System initialization completed: {len(tenants)} tenants, {len(properties)} properties, {len(landlords)} landlords")
-        return result
+        return response
         
     except Exception as e:
         logger.error(f"System initialization failed: {str(e)}")
@@ -227,20 +279,24 @@ async def start_negotiation(request: StartNegotiationRequest):
     """
     global NEGOTIATION_ROUND
     NEGOTIATION_ROUND += 1  # Increment each time called
+    # Snapshot this request's round: the global may move on while we await below
+    negotiation_round = NEGOTIATION_ROUND
     try:
         logger.info(f"Starting negotiation process, tenant IDs: {request.tenant_ids}")
         
-        # Get all initialized tenant and landlord data
-        all_tenants = await group_service._get_all_tenants()
-        all_landlords = await group_service._get_all_landlords()
+        # Check that data is initialized and fetch the requested tenants in one concurrent wave
+        data_initialized, tenants_by_id = await asyncio.gather(
+            group_service._has_tenants_and_landlords(),
+            group_service._get_tenants_by_ids(request.tenant_ids),
+        )
 
-        if not all_tenants or not all_landlords:
+        if not data_initialized:
             raise HTTPException(status_code=400, detail="No available tenant or landlord data, please call initialization API first")
         
-        # Get valid tenants
+        # Get valid tenants - kept in request order
         participating_tenants = []
         for tenant_id in request.tenant_ids:
-            tenant_data = await group_service._get_tenant_by_id(tenant_id)
+            tenant_data = tenants_by_id.get(tenant_id)
             if tenant_data and tenant_data.rental_status.is_rented is False:
                 participating_tenants.append(tenant_data)
             else:
@@ -249,54 +305,34 @@ async def start_negotiation(request: StartNegotiationRequest):
         if not participating_tenants:
             raise HTTPException(status_code=400, detail="No valid tenants found")
         
-        # Create negotiation sessions - create one session for each tenant
+        # Create negotiation sessions - one per tenant, notifying as each one starts.
+        # Matching stays sequential: each session locks its property, and the next
+        # tenant's match must see that lock to avoid double-booking
         sessions = []
-        total_sessions = len(participating_tenants)  # Create session for each participating tenant
-        
-        for i in range(total_sessions):
-            tenant = participating_tenants[i]
-            
-            # Use GroupNegotiationService to find best property match
-            best_match = await group_service.find_best_property_for_tenant(tenant.tenant_id)
-            
-            if not best_match:
-                logger.warning(f"No suitable property found for tenant {tenant.name}, skipping session creation")
-                continue
-            else:
-                # Use GroupNegotiationService to create formal negotiation session
-                negotiation_session = await group_service.create_negotiation_session(tenant, best_match)
-                if negotiation_session:
-                    session_data = negotiation_session
-                else:
-                    logger.error(f"Failed to create negotiation session for tenant {tenant.name}")
-                    session_id = f"session_{uuid.uuid4().hex[:8]}_{int(time.time())}"
-                    session_data = {
-                        "session_id": session_id,
-                        "tenant_name": tenant.name,
-                        "landlord_name": best_match.get("landlord_name", "unknown landlord"),
-                        "property_address": best_match.get("display_address", "Unknown Address"),
-                        "status": "error",
-                        "created_at": datetime.now().isoformat(),
-                        "negotiation_round": NEGOTIATION_ROUND
-                    }
-            
-            sessions.append(session_data)
-            
-            # Send initialization message to WebSocket
-            try:
-                tenant_name = tenant.get("name") if isinstance(tenant, dict) else tenant.name
-                landlord_name = session_data.get("landlord_name", "unknown landlord")
-                await manager.send_message_to_session(session_data["session_id"], {
-                    "type": "negotiation_started",
-                    "session_id": session_data["session_id"],
-                    "message": f"Negotiation started: {tenant_name} is negotiating with {landlord_name}",
-                    "session_info": session_data,
-                    "timestamp": datetime.now().isoformat()
-                })
-                
-                
-            except Exception as ws_error:
-                logger.warning(f"WebSocket message sending failed {session_data['session_id']}: {ws_error}")
+        session_iter = group_service.iter_negotiation_sessions(participating_tenants, negotiation_round)
+        try:
+            async for tenant, session_data in session_iter:
+                sessions.append(session_data)
+
+                # Skip event construction entirely when nobody is subscribed yet
+                if not manager.has_listeners(session_data["session_id"]):
+                    continue
+
+                # Send initialization message to WebSocket
+                try:
+                    tenant_name = tenant.get("name") if isinstance(tenant, dict) else tenant.name
+                    landlord_name = session_data.get("landlord_name", "unknown landlord")
+                    await manager.send_message_to_session(session_data["session_id"], {
+                        "type": "negotiation_started",
+                        "session_id": session_data["session_id"],
+                        "message": f"Negotiation started: {tenant_name} is negotiating with {landlord_name}",
+                        "session_info": session_data,
+                        "timestamp": now_iso()
+                    })
+                except Exception as ws_error:
+                    logger.warning(f"WebSocket message sending failed {session_data['session_id']}: {ws_error}")
+        finally:
+            await session_iter.aclose()
 
         result = {
             "message": "Negotiation process started successfully",
@@ -311,6 +347,8 @@ async def start_negotiation(request: StartNegotiationRequest):
         logger.info(f"Negotiation process started successfully: {len(sessions)} sessions, using actual agent names")
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to start negotiation process: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to start negotiation: {str(e)}")
@@ -332,21 +370,22 @@ async def get_all_sessions():
 @app.get("/sessions/{session_id}")
 async def get_session(session_id: str):
     """Get detailed information for a specific negotiation session"""
+    session = await group_service.get_session_info(session_id)
+    if not session:
+        # Expected miss on a polled endpoint - answer directly instead of raising
+        return ORJSONResponse(status_code=404, content={"detail": "Session does not exist"})
+
     try:
-        session = await group_service.get_session_info(session_id)
-        if not session:
-            raise HTTPException(status_code=404, detail="Session does not exist")
-        
         # Special handling: Check if WebSocket connection exists, if so inform frontend to maintain connection
-        has_websocket = session_id in manager.active_connections
+        connection_count = manager.connection_count(session_id)
         
         # Return session information and WebSocket connection status
         response_data = {
             **session,
             "websocket_status": {
-                "has_active_connection": has_websocket,
-                "connection_count": len(manager.active_connections.get(session_id, set())),
-                "timestamp": datetime.now().isoformat()
+                "has_active_connection": connection_count > 0,
+                "connection_count": connection_count,
+                "timestamp": now_iso()
             }
         }
         
@@ -367,6 +406,71 @@ async def get_stats():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Fixed error replies, encoded once per wire format (keyed by "is binary")
+_INVALID_FORMAT_ERROR = {"type": "error", "error": "Invalid message format. Expected a JSON object with a 'type' field"}
+_PAYLOAD_TOO_LARGE_ERROR = {"type": "error", "error": "payload too large"}
+_INVALID_FORMAT_FRAMES = {False: encode_message(_INVALID_FORMAT_ERROR), True: encode_binary(_INVALID_FORMAT_ERROR)}
+_PAYLOAD_TOO_LARGE_FRAMES = {False: encode_message(_PAYLOAD_TOO_LARGE_ERROR), True: encode_binary(_PAYLOAD_TOO_LARGE_ERROR)}
+
+
+# Seconds between server_ping pushes; one shared timer covers every connection
+SERVER_PING_INTERVAL = 30
+
+
+async def _broadcast_server_ping():
+    """Periodically send server_ping to every connection, encoded once per wire format"""
+    while True:
+        await asyncio.sleep(SERVER_PING_INTERVAL)
+        try:
+            await manager.broadcast_to_all_sessions({
+                "type": "server_ping",
+                "timestamp": now_iso()
+            })
+        except Exception as e:
+            logger.debug(f"Server ping broadcast failed: {str(e)}")
+
+
+# Seconds between connection_status pushes to every subscribed session
+CONNECTION_STATUS_INTERVAL = 50
+
+
+async def _broadcast_connection_status():
+    """Periodically tell every session's subscribers that their connection is active"""
+    while True:
+        await asyncio.sleep(CONNECTION_STATUS_INTERVAL)
+        for session_id in list(manager.active_connections):
+            try:
+                await manager.send_message_to_session(session_id, {
+                    "type": "connection_status",
+                    "status": "active",
+                    "session_id": session_id,
+                    "timestamp": now_iso()
+                })
+            except Exception as e:
+                logger.debug(f"Connection status broadcast failed for {session_id}: {str(e)}")
+
+
+# Heartbeat frames keyed by (message type, binary format), stored with the timestamp
+# they carry; every connection reuses them until the second rolls over
+_heartbeat_frames: dict[tuple[str, bool], tuple[str, str | bytes]] = {}
+
+
+def _heartbeat_frame(message_type: str, binary: bool) -> str | bytes:
+    """Return a heartbeat reply frame, re-encoding its timestamp at most once per second"""
+    timestamp = now_iso()
+    cached = _heartbeat_frames.get((message_type, binary))
+    if cached and cached[0] == timestamp:
+        return cached[1]
+
+    message = {
+        "type": message_type,
+        "timestamp": timestamp
+    }
+    frame = encode_binary(message) if binary else encode_message(message)
+    _heartbeat_frames[(message_type, binary)] = (timestamp, frame)
+    return frame
+
+
 @app.websocket("/ws/{session_id}")
 async def websocket_negotiation(websocket: WebSocket, session_id: str):
     """WebSocket endpoint for real-time negotiation communication and streaming message push"""
@@ -374,18 +478,18 @@ async def websocket_negotiation(websocket: WebSocket, session_id: str):
     
     try:
         # Send connection success message
-        await websocket.send_json({
+        await manager.send(websocket, {
             "type": "connected",
             "session_id": session_id,
             "message": "WebSocket connection established",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         })
         
         # If it's a specific session, verify session exists and send session information
         if session_id != "global":
             session = await group_service.get_session_info(session_id)
             if session:
-                await websocket.send_json({
+                await manager.send(websocket, {
                     "type": "session_info",
                     "session_id": session_id,
                     "tenant_name": session["tenant_name"],
@@ -394,67 +498,59 @@ async def websocket_negotiation(websocket: WebSocket, session_id: str):
                     "monthly_rent": session["monthly_rent"],
                     "match_score": session["match_score"],
                     "status": session["status"],
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": now_iso()
                 })
                 
                 # Send additional confirmation message to ensure frontend knows WebSocket connection is working properly
-                await websocket.send_json({
+                await manager.send(websocket, {
                     "type": "websocket_ready",
                     "message": "Real-time conversation ready, dialogue will continue",
                     "session_id": session_id,
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": now_iso()
                 })
                 
                 # Send session history messages
                 if session.get("messages"):
-                    await websocket.send_json({
+                    await manager.send(websocket, {
                         "type": "history",
                         "messages": session["messages"],
-                        "timestamp": datetime.now().isoformat()
+                        "timestamp": now_iso()
                     })
         
         # Keep connection active, listen for messages
-        ping_counter = 0
         while True:
             try:
-                # Use shorter timeout to enable periodic heartbeat sending
-                data = await asyncio.wait_for(websocket.receive_json(), timeout=15)
+                # No per-connection timeout: server_ping is pushed by one shared timer
+                try:
+                    data = await manager.receive(websocket)
+                except PayloadTooLargeError as e:
+                    logger.warning(f"Rejected oversized WebSocket message on {session_id}: {str(e)}")
+                    await manager.send_encoded(websocket, _PAYLOAD_TOO_LARGE_FRAMES[manager.is_binary(websocket)])
+                    continue
+                except (orjson.JSONDecodeError, ormsgpack.MsgpackDecodeError):
+                    logger.debug("Rejecting undecodable WebSocket message on {}", session_id)
+                    await manager.send_encoded(websocket, _INVALID_FORMAT_FRAMES[manager.is_binary(websocket)])
+                    continue
+
+                # Only JSON objects are valid client messages; reject anything else
+                # instead of letting data.get() raise and drop the connection
+                if not isinstance(data, dict):
+                    logger.debug("Rejecting malformed WebSocket message on {}", session_id)
+                    await manager.send_encoded(websocket, _INVALID_FORMAT_FRAMES[manager.is_binary(websocket)])
+                    continue
                 
                 # Handle heartbeat
                 if data.get("type") == "ping":
-                    await websocket.send_json({
-                        "type": "pong", 
-                        "timestamp": datetime.now().isoformat()
-                    })
-                    ping_counter += 1
-                    # Send session status update every 5 heartbeats
-                    if ping_counter % 5 == 0:
-                        await websocket.send_json({
-                            "type": "connection_status",
-                            "status": "active",
-                            "session_id": session_id,
-                            "timestamp": datetime.now().isoformat()
-                        })
+                    await manager.send_encoded(websocket, _heartbeat_frame("pong", manager.is_binary(websocket)))
                     continue
                 
                 # Handle other message types
-                await websocket.send_json({
+                await manager.send(websocket, {
                     "type": "message_received",
                     "data": data,
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": now_iso()
                 })
                 
-            except asyncio.TimeoutError:
-                # Send active heartbeat on timeout to maintain connection
-                try:
-                    await websocket.send_json({
-                        "type": "server_ping", 
-                        "timestamp": datetime.now().isoformat()
-                    })
-                except Exception as e:
-                    logger.debug(f"Heartbeat sending failed, connection may be disconnected: {str(e)}")
-                    break
-            
             except Exception as e:
                 if isinstance(e, WebSocketDisconnect):
                     logger.debug(f"WebSocket client disconnected: {str(e)}")
@@ -470,18 +566,51 @@ async def websocket_negotiation(websocket: WebSocket, session_id: str):
         manager.disconnect(websocket, session_id)
 
 
-@app.post("/reset-memory")
-async def reset_conversation():
-    """Reset conversation state"""
+# Set while a memory reset runs so repeated requests don't queue duplicate resets
+_memory_reset_in_progress = False
+
+
+async def _run_memory_reset():
+    """Reset conversation state in the background and log the outcome"""
+    global _memory_reset_in_progress
     try:
         result = await reset_conversation_state()
-        logger.info("Conversation memory reset successfully")
-        return result
+        logger.info(f"Conversation memory reset successfully: {result['message']}")
     except Exception as e:
         logger.error(f"Memory reset failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        _memory_reset_in_progress = False
+
+
+@app.post("/reset-memory", status_code=202)
+async def reset_conversation(background_tasks: BackgroundTasks):
+    """Schedule a conversation state reset and return immediately"""
+    global _memory_reset_in_progress
+    if _memory_reset_in_progress:
+        return {"status": "in_progress", "message": "Conversation memory reset already running"}
+
+    _memory_reset_in_progress = True
+    background_tasks.add_task(_run_memory_reset)
+    return {"status": "scheduled", "message": "Conversation memory reset scheduled"}
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop + httptools ship with uvicorn[standard] (pulled in by fastapi[standard]).
+    # Keep a single worker: sessions and WebSocket subscriptions live in process memory.
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+        # Let the protocol layer refuse frames far beyond what the handler will decode
+        ws_max_size=MAX_INBOUND_FRAME_BYTES * 4,
+        # Shed load with 503s instead of degrading every connection, allow a deeper
+        # accept queue for reconnect bursts, and let browsers reuse keep-alive
+        # connections between API calls instead of reconnecting after 5s idle
+        limit_concurrency=1000,
+        backlog=2048,
+        timeout_keep_alive=30,
+    )
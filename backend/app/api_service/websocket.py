@@ -3,9 +3,38 @@ WebSocket connection management for real-time agent communication
 """
 from typing import Dict, Set, Callable, Any, Coroutine, List
 import asyncio
-import json
-from fastapi import WebSocket
+from fastapi import WebSocket, WebSocketDisconnect
 from loguru import logger
+import orjson
+import ormsgpack
+
+# WebSocket subprotocol a client offers to receive MessagePack instead of JSON frames
+MSGPACK_SUBPROTOCOL = "msgpack"
+
+# Largest inbound client frame that gets decoded; clients only send small control messages
+MAX_INBOUND_FRAME_BYTES = 32_768
+
+# Outbound frames buffered per connection before a slow client is dropped
+SEND_QUEUE_SIZE = 1024
+# Close code for clients that cannot keep up ("Try Again Later")
+SLOW_CLIENT_CLOSE_CODE = 1013
+
+
+class PayloadTooLargeError(ValueError):
+    """Raised when a client frame exceeds MAX_INBOUND_FRAME_BYTES"""
+
+
+def encode_message(message: Any) -> str:
+    """Serialize a WebSocket payload with orjson
+
+    Returned as text rather than bytes because the frontend JSON.parses text frames.
+    """
+    return orjson.dumps(message).decode()
+
+
+def encode_binary(message: Any) -> bytes:
+    """Serialize a WebSocket payload as MessagePack for clients that negotiated it"""
+    return ormsgpack.packb(message)
 
 
 class ConnectionManager:
@@ -15,55 +44,185 @@ class ConnectionManager:
         self.active_connections: Dict[str, Set[WebSocket]] = {}
         self.background_tasks: List[asyncio.Task] = []
         self._lock = asyncio.Lock()
+        # Connections that negotiated the MessagePack subprotocol; all others use JSON text
+        self._binary_connections: Set[WebSocket] = set()
+        # Per-connection outbound queues drained by one sender task each, so a slow
+        # client only backs up its own queue instead of stalling session broadcasts
+        self._send_queues: Dict[WebSocket, asyncio.Queue] = {}
+        self._sender_tasks: Dict[WebSocket, asyncio.Task] = {}
+        # Session each connection subscribed to, for dropping it from a single-connection send
+        self._connection_sessions: Dict[WebSocket, str] = {}
     
     async def connect(self, websocket: WebSocket, session_id: str):
         """Connect a WebSocket to a session"""
-        await websocket.accept()
+        if MSGPACK_SUBPROTOCOL in websocket.scope.get("subprotocols", []):
+            await websocket.accept(subprotocol=MSGPACK_SUBPROTOCOL)
+            self._binary_connections.add(websocket)
+        else:
+            await websocket.accept()
         async with self._lock:
             if session_id not in self.active_connections:
                 self.active_connections[session_id] = set()
             self.active_connections[session_id].add(websocket)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self._send_queues[websocket] = queue
+        self._connection_sessions[websocket] = session_id
+        self._sender_tasks[websocket] = asyncio.create_task(
+            self._drain_send_queue(websocket, session_id, queue)
+        )
         logger.info(f"WebSocket connection established, session ID: {session_id}")
     
     def disconnect(self, websocket: WebSocket, session_id: str):
         """Disconnect a WebSocket from a session"""
+        self._binary_connections.discard(websocket)
+        self._send_queues.pop(websocket, None)
+        self._connection_sessions.pop(websocket, None)
+        sender = self._sender_tasks.pop(websocket, None)
+        if sender and sender is not asyncio.current_task():
+            sender.cancel()
         if session_id in self.active_connections:
             self.active_connections[session_id].discard(websocket)
             if not self.active_connections[session_id]:
                 del self.active_connections[session_id]
         logger.info(f"WebSocket connection disconnected, session ID: {session_id}")
-    
+
+    async def _drain_send_queue(self, websocket: WebSocket, session_id: str, queue: asyncio.Queue):
+        """Send queued frames to one connection in order
+
+        This task is the only writer to the socket, so frames never interleave.
+        """
+        while True:
+            payload = await queue.get()
+            try:
+                await self._write(websocket, payload)
+            except Exception as e:
+                logger.error(f"Failed to send message to WebSocket: {str(e)}")
+                self.disconnect(websocket, session_id)
+                return
+
+    def _enqueue(self, websocket: WebSocket, session_id: str, payload: str | bytes):
+        """Hand a frame to a connection's sender task without waiting on the socket
+
+        A client whose queue is full is too slow: it is disconnected and closed.
+        """
+        queue = self._send_queues.get(websocket)
+        if queue is None:
+            return
+        try:
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            logger.warning(f"WebSocket client too slow, closing connection, session ID: {session_id}")
+            self.disconnect(websocket, session_id)
+            self.start_background_task(self._close_slow_client, websocket)
+
+    async def _close_slow_client(self, websocket: WebSocket):
+        """Close a connection that fell too far behind"""
+        try:
+            await websocket.close(code=SLOW_CLIENT_CLOSE_CODE)
+        except Exception as e:
+            logger.debug(f"Closing slow WebSocket client failed: {str(e)}")
+
+    def has_listeners(self, session_id: str) -> bool:
+        """Check whether any WebSocket is subscribed to a session"""
+        return bool(self.active_connections.get(session_id))
+
+    def connection_count(self, session_id: str) -> int:
+        """Count the WebSockets subscribed to a session"""
+        connections = self.active_connections.get(session_id)
+        return len(connections) if connections else 0
+
+    def is_binary(self, websocket: WebSocket) -> bool:
+        """Check whether a connection negotiated MessagePack frames"""
+        return websocket in self._binary_connections
+
+    def encode_for(self, websocket: WebSocket, message: dict) -> str | bytes:
+        """Encode a message in the format the connection negotiated"""
+        return encode_binary(message) if self.is_binary(websocket) else encode_message(message)
+
+    async def _write(self, websocket: WebSocket, payload: str | bytes):
+        """Write an already encoded payload to the socket as a binary or text frame"""
+        if isinstance(payload, bytes):
+            await websocket.send_bytes(payload)
+        else:
+            await websocket.send_text(payload)
+
+    async def send_encoded(self, websocket: WebSocket, payload: str | bytes):
+        """Queue an already encoded payload for a single WebSocket"""
+        session_id = self._connection_sessions.get(websocket)
+        if session_id is not None:
+            self._enqueue(websocket, session_id, payload)
+
+    async def send(self, websocket: WebSocket, message: dict):
+        """Send a message to a single WebSocket"""
+        await self.send_encoded(websocket, self.encode_for(websocket, message))
+
+    async def receive(self, websocket: WebSocket) -> Any:
+        """Receive and decode one message from a single WebSocket
+
+        Text and binary frames are both accepted and handed to orjson as-is, so JSON
+        clients may send either. Binary frames on a MessagePack connection are unpacked.
+
+        Raises:
+            PayloadTooLargeError: If the frame is too large to be worth decoding
+            WebSocketDisconnect: If the client disconnected
+        """
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+
+        raw = message.get("bytes")
+        if raw is None:
+            raw = message.get("text", "")
+        # Text frames arrive decoded, so measure their UTF-8 size rather than the character count
+        size = len(raw) if isinstance(raw, bytes) else len(raw.encode())
+        if size > MAX_INBOUND_FRAME_BYTES:
+            raise PayloadTooLargeError(f"Inbound frame of {size} bytes exceeds {MAX_INBOUND_FRAME_BYTES}")
+        if isinstance(raw, bytes) and self.is_binary(websocket):
+            return ormsgpack.unpackb(raw)
+        return orjson.loads(raw)
+
     async def send_message_to_session(self, session_id: str, message: dict):
         """Send a message to all WebSockets in a session"""
+        await self._fan_out(
+            session_id,
+            lambda binary: encode_binary(message) if binary else encode_message(message),
+        )
+
+    async def _fan_out(self, session_id: str, encode: Callable[[bool], str | bytes]):
+        """Queue a frame for every WebSocket in a session, encoding once per wire format"""
         if session_id in self.active_connections:
-            disconnected = set()
             async with self._lock:
                 connections = self.active_connections.get(session_id, set()).copy()
             
+            # Encode once per format for all subscribers of the session
+            payloads = {}
+            try:
+                for connection in connections:
+                    binary = connection in self._binary_connections
+                    if binary not in payloads:
+                        payloads[binary] = encode(binary)
+            except TypeError as e:
+                logger.error(f"Failed to serialize WebSocket message: {str(e)}")
+                return
+
             for connection in connections:
-                try:
-                    await connection.send_text(json.dumps(message))
-                except Exception as e:
-                    logger.error(f"Failed to send message to WebSocket: {str(e)}")
-                    disconnected.add(connection)
-            
-            # Clean up disconnected connections
-            if disconnected:
-                async with self._lock:
-                    if session_id in self.active_connections:
-                        for connection in disconnected:
-                            self.active_connections[session_id].discard(connection)
-                        if not self.active_connections[session_id]:
-                            del self.active_connections[session_id]
+                self._enqueue(connection, session_id, payloads[connection in self._binary_connections])
     
     async def broadcast_to_all_sessions(self, message: dict):
-        """Broadcast message to all sessions"""
+        """Broadcast message to all sessions, encoding it once per wire format overall"""
         session_ids = []
         async with self._lock:
             session_ids = list(self.active_connections.keys())
         
+        payloads = {}
+
+        def encode(binary: bool) -> str | bytes:
+            if binary not in payloads:
+                payloads[binary] = encode_binary(message) if binary else encode_message(message)
+            return payloads[binary]
+
         for session_id in session_ids:
-            await self.send_message_to_session(session_id, message)
+            await self._fan_out(session_id, encode)
     
     async def stream_to_session(self, session_id: str, stream_generator, message_type="stream_chunk"):
         """
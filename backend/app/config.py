@@ -89,6 +89,7 @@ class LangSmithSettings(BaseModel):
 class AgentsSettings(BaseModel):
     total_messages_summary_trigger: int = Field(30, description="Number of messages that trigger a conversation summary")
     total_messages_after_summary: int = Field(5, description="Number of messages to keep after summarization")
+    max_concurrent_negotiations: int = Field(8, description="Maximum number of negotiations running concurrently")
 
 class GoogleMapsSettings(BaseModel):
     api_key: str = Field(..., description="Google Maps API key")
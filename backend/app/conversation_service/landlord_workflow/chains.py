@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_openai import ChatOpenAI
 
@@ -8,6 +10,8 @@ from app.conversation_service.prompt import (
     RENTAL_SUMMARY_PROMPT,
 )
 
+# One client per (temperature, model) so its HTTP connection pool is reused across turns
+@lru_cache(maxsize=None)
 def get_chat_model(temperature: float = 0.7, model_name: str = "default") -> ChatOpenAI:
     llm_config = config.llm.get(model_name, config.llm["default"])
     return ChatOpenAI(
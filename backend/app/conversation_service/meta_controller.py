@@ -4,6 +4,7 @@ Meta Controller Graph for Multi-Agent Conversations
 This module implements a LangGraph-based controller that coordinates conversations
 between tenant and landlord agents, with proper streaming support and termination logic.
 """
+from functools import lru_cache
 from typing import List, Dict, Any, TypedDict, Literal
 import json
 from langgraph.checkpoint.mongodb.aio import AsyncMongoDBSaver
@@ -42,7 +43,6 @@ class ExtendedMetaState(MetaState, total=False):
     match_reasons: List[str]  # Reasons for matching
     status: str  # Session status (active, completed, etc.)
     created_at: str  # Creation timestamp
-    task: Any  # Associated async task, Any type to avoid circular imports
     negotiation_round: int  # Global negotiation round counter
 
 
@@ -111,8 +111,8 @@ def tenant_graph_output_adapter(output: Dict[str, Any], state: MetaState):
     # Update conversation history
     if "messages" in output and output["messages"]:
         last_message = output["messages"][-1]
-        logger.debug(f"🔍 Tenant adapter - last_message type: {type(last_message)}")
-        logger.debug(f"🔍 Tenant adapter - last_message content: {last_message}")
+        logger.debug("🔍 Tenant adapter - last_message type: {}", type(last_message))
+        logger.debug("🔍 Tenant adapter - last_message content: {}", last_message)
         
         # 🎯 修复：检查消息类型并正确处理
         if hasattr(last_message, 'content'):
@@ -196,8 +196,8 @@ def landlord_graph_output_adapter(output: Dict[str, Any], state: MetaState):
     # Update conversation history
     if "messages" in output and output["messages"]:
         last_message = output["messages"][-1]
-        logger.debug(f"🔍 Landlord adapter - last_message type: {type(last_message)}")
-        logger.debug(f"🔍 Landlord adapter - last_message content: {last_message}")
+        logger.debug("🔍 Landlord adapter - last_message type: {}", type(last_message))
+        logger.debug("🔍 Landlord adapter - last_message content: {}", last_message)
         
         # 🎯 修复：检查消息类型并正确处理
         if hasattr(last_message, 'content'):
@@ -249,6 +249,19 @@ async def call_landlord(state: MetaState) -> MetaState:
 
 
 
+@lru_cache(maxsize=1)
+def get_default_llm() -> ChatOpenAI:
+    """Shared client for the default LLM config, reused so HTTP connections stay alive"""
+    llm_config = config.llm.get("default", {})
+    return ChatOpenAI(
+        api_key=llm_config.api_key,
+        model=llm_config.model,
+        base_url=llm_config.base_url,
+        temperature=llm_config.temperature,
+        max_tokens=llm_config.max_tokens,
+    )
+
+
 def should_continue(state: MetaState) -> str:
     try:
         messages = state.get("messages", [])
@@ -269,15 +282,7 @@ def should_continue(state: MetaState) -> str:
             conversation_text=conversation_text,
         )
 
-         # Configure LLM
-        llm_config = config.llm.get("default", {})
-        llm = ChatOpenAI(
-            api_key=llm_config.api_key,
-            model=llm_config.model,
-            base_url=llm_config.base_url,
-            temperature=llm_config.temperature,
-            max_tokens=llm_config.max_tokens,
-        )
+        llm = get_default_llm()
         message = HumanMessage(content=prompt)
         result = invoke_llm_sync_with_backoff(llm, [message])
         # Clean up potential markdown code block delimiters
@@ -348,27 +353,27 @@ async def stream_conversation_with_state_update(initial_state: ExtendedMetaState
 
     try:
         async for event in graph.astream(state_copy):
-            logger.debug(f"🔍 Event received: {type(event)} - {event.keys()}")
+            logger.debug("🔍 Event received: {} - {}", type(event), event.keys())
             
             node_output = None
             # The event contains node output directly under the node name key
             if "call_tenant" in event:
                 node_output = event["call_tenant"]
-                logger.debug(f"🔍 Tenant node output type: {type(node_output)}")
+                logger.debug("🔍 Tenant node output type: {}", type(node_output))
             elif "call_landlord" in event:
                 node_output = event["call_landlord"]
-                logger.debug(f"🔍 Landlord node output type: {type(node_output)}")
+                logger.debug("🔍 Landlord node output type: {}", type(node_output))
 
             if node_output:
-                logger.debug(f"🔍 Node output keys: {node_output.keys() if isinstance(node_output, dict) else 'Not a dict'}")
+                logger.debug("🔍 Node output keys: {}", node_output.keys() if isinstance(node_output, dict) else 'Not a dict')
                 
                 initial_state.update(node_output)
                 
                 # Find the latest message to yield
                 if "messages" in node_output and node_output["messages"]:
                     latest_message = node_output["messages"][-1]
-                    logger.debug(f"🔍 Latest message type: {type(latest_message)}")
-                    logger.debug(f"🔍 Latest message content preview: {str(latest_message)[:100]}")
+                    logger.debug("🔍 Latest message type: {}", type(latest_message))
+                    logger.debug("🔍 Latest message content preview: {}", str(latest_message)[:100])
                     
                     # 🎯 修复：安全地处理消息属性
                     if hasattr(latest_message, 'content'):
@@ -1,3 +1,5 @@
+import asyncio
+
 from loguru import logger
 from pymongo import MongoClient
 
@@ -18,43 +20,44 @@ async def reset_conversation_state() -> dict:
         Exception: If there's an error connecting to MongoDB or deleting collections
     """
     try:
-        # Check if MongoDB configuration exists
-        if not config.mongodb:
-            raise Exception("MongoDB configuration not found")
-        
-        mongodb_config = config.mongodb
-        client = MongoClient(mongodb_config.connection_string)
-        db = client[mongodb_config.database]
+        # pymongo is blocking, so drop the collections in a worker thread
+        return await asyncio.to_thread(_drop_conversation_state_collections)
+    except Exception as e:
+        logger.error(f"Failed to reset conversation state: {str(e)}")
+        raise Exception(f"Failed to reset conversation state: {str(e)}")
 
-        collections_deleted = []
 
-        # Delete state checkpoint collection
-        if mongodb_config.mongo_state_checkpoint_collection in db.list_collection_names():
-            db.drop_collection(mongodb_config.mongo_state_checkpoint_collection)
-            collections_deleted.append(mongodb_config.mongo_state_checkpoint_collection)
-            logger.info(
-                f"Deleted collection: {mongodb_config.mongo_state_checkpoint_collection}"
-            )
+def _drop_conversation_state_collections() -> dict:
+    """Drop the LangGraph checkpoint and writes collections if they exist."""
+    # Check if MongoDB configuration exists
+    if not config.mongodb:
+        raise Exception("MongoDB configuration not found")
 
-        # Delete state writes collection
-        if mongodb_config.mongo_state_writes_collection in db.list_collection_names():
-            db.drop_collection(mongodb_config.mongo_state_writes_collection)
-            collections_deleted.append(mongodb_config.mongo_state_writes_collection)
-            logger.info(f"Deleted collection: {mongodb_config.mongo_state_writes_collection}")
+    mongodb_config = config.mongodb
+    client = MongoClient(mongodb_config.connection_string)
+    try:
+        db = client[mongodb_config.database]
+        existing_collections = set(db.list_collection_names())
 
+        collections_deleted = []
+        for collection_name in (
+            mongodb_config.mongo_state_checkpoint_collection,
+            mongodb_config.mongo_state_writes_collection,
+        ):
+            if collection_name in existing_collections:
+                db.drop_collection(collection_name)
+                collections_deleted.append(collection_name)
+                logger.info(f"Deleted collection: {collection_name}")
+    finally:
         client.close()
 
-        if collections_deleted:
-            return {
-                "status": "success",
-                "message": f"Successfully deleted collections: {', '.join(collections_deleted)}",
-            }
-        else:
-            return {
-                "status": "success",
-                "message": "No collections needed to be deleted",
-            }
-
-    except Exception as e:
-        logger.error(f"Failed to reset conversation state: {str(e)}")
-        raise Exception(f"Failed to reset conversation state: {str(e)}")
+    if collections_deleted:
+        return {
+            "status": "success",
+            "message": f"Successfully deleted collections: {', '.join(collections_deleted)}",
+        }
+    else:
+        return {
+            "status": "success",
+            "message": "No collections needed to be deleted",
+        }
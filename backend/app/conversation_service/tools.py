@@ -358,8 +358,25 @@ def analyze_rental_market_info(
                     "count": len(price_list)
                 }
         
+        # Focused analyses only need the headline numbers, skip building the full report
+        if analysis_type == "pricing":
+            # Focus on price analysis only
+            price_summary = "\n\n�️ �📈 **DETAILED PRICING ANALYSIS:**\n"
+            price_summary += f"   • Market Average: £{avg_price:.0f}/month\n"
+            price_summary += f"   • Market Median: £{median_price:.0f}/month\n"
+            price_summary += f"   • Price Variance: {((max_price - min_price) / avg_price * 100):.1f}%\n"
+            return price_summary
+        
+        elif analysis_type == "availability":
+            # Focus on availability only
+            return f"🛠️ 🏠 **AVAILABILITY ANALYSIS:**\n   • {available_properties} out of {total_properties} properties available ({availability_rate:.1f}%)\n   • Market Status: {'Buyer\'s Market' if availability_rate > 60 else 'Seller\'s Market' if availability_rate < 40 else 'Balanced Market'}"
+        
+        elif analysis_type == "trends":
+            # Focus on trends (simplified for now)
+            return f"�️ �📈 **MARKET TRENDS:**\n   • Average rent in {location or 'analyzed area'}: £{avg_price:.0f}\n   • Most common property type: {type_stats.most_common(1)[0][0] if type_stats else 'N/A'}\n   • Availability trend: {availability_rate:.1f}% available"
+        
         # Build comprehensive report
-        report = f"""
+        report_parts = [f"""
 🛠️ 🏘️ **RENTAL MARKET ANALYSIS REPORT**
 📍 **Search Criteria:**
    • Location: {location or 'All areas'}
@@ -373,77 +390,63 @@ def analyze_rental_market_info(
    • Price Range: £{min_price:.0f} - £{max_price:.0f}
    • Availability Rate: {availability_rate:.1f}% ({available_properties}/{total_properties} available)
 
-🏠 **PROPERTY TYPE BREAKDOWN:**"""
+🏠 **PROPERTY TYPE BREAKDOWN:**"""]
         
         for prop_type, count in type_stats.most_common(5):
             percentage = (count / total_properties * 100)
-            report += f"\n   • {prop_type}: {count} properties ({percentage:.1f}%)"
+            report_parts.append(f"\n   • {prop_type}: {count} properties ({percentage:.1f}%)")
         
-        report += "\n\n🛏️ **BEDROOM DISTRIBUTION:**"
+        report_parts.append("\n\n🛏️ **BEDROOM DISTRIBUTION:**")
         for bedrooms, count in sorted(bedroom_stats.items()):
             percentage = (count / total_properties * 100)
-            report += f"\n   • {bedrooms} bedroom(s): {count} properties ({percentage:.1f}%)"
+            report_parts.append(f"\n   • {bedrooms} bedroom(s): {count} properties ({percentage:.1f}%)")
         
         if bedroom_price_analysis:
-            report += "\n\n💰 **PRICING BY BEDROOMS:**"
+            report_parts.append("\n\n💰 **PRICING BY BEDROOMS:**")
             for bedrooms in sorted(bedroom_price_analysis.keys()):
                 stats = bedroom_price_analysis[bedrooms]
-                report += f"\n   • {bedrooms} bedroom(s): £{stats['average']:.0f} avg (£{stats['min']:.0f}-£{stats['max']:.0f})"
+                report_parts.append(f"\n   • {bedrooms} bedroom(s): £{stats['average']:.0f} avg (£{stats['min']:.0f}-£{stats['max']:.0f})")
         
-        report += "\n\n📍 **TOP LOCATIONS:**"
+        report_parts.append("\n\n📍 **TOP LOCATIONS:**")
         for district, count in district_stats.most_common(5):
             percentage = (count / total_properties * 100)
-            report += f"\n   • {district}: {count} properties ({percentage:.1f}%)"
+            report_parts.append(f"\n   • {district}: {count} properties ({percentage:.1f}%)")
         
         if amenity_stats:
-            report += "\n\n🎯 **POPULAR AMENITIES:**"
+            report_parts.append("\n\n🎯 **POPULAR AMENITIES:**")
             for amenity, count in amenity_stats.most_common(8):
                 percentage = (count / total_properties * 100)
-                report += f"\n   • {amenity}: {count} properties ({percentage:.1f}%)"
+                report_parts.append(f"\n   • {amenity}: {count} properties ({percentage:.1f}%)")
         
         # Add market insights and recommendations
-        report += "\n\n💡 **MARKET INSIGHTS:**"
+        report_parts.append("\n\n💡 **MARKET INSIGHTS:**")
         
         if availability_rate > 70:
-            report += f"\n   • 🟢 High availability ({availability_rate:.1f}%) - Buyer's market"
+            report_parts.append(f"\n   • 🟢 High availability ({availability_rate:.1f}%) - Buyer's market")
         elif availability_rate > 40:
-            report += f"\n   • 🟡 Moderate availability ({availability_rate:.1f}%) - Balanced market"
+            report_parts.append(f"\n   • 🟡 Moderate availability ({availability_rate:.1f}%) - Balanced market")
         else:
-            report += f"\n   • 🔴 Low availability ({availability_rate:.1f}%) - Seller's market"
+            report_parts.append(f"\n   • 🔴 Low availability ({availability_rate:.1f}%) - Seller's market")
         
         if avg_price > 0:
             if budget_max > 0:
                 if avg_price < budget_max * 0.8:
-                    report += "\n   • 💚 Budget is above market average - Good negotiation position"
+                    report_parts.append("\n   • 💚 Budget is above market average - Good negotiation position")
                 elif avg_price < budget_max:
-                    report += "\n   • 🟡 Budget aligns with market - Standard negotiation expected"
+                    report_parts.append("\n   • 🟡 Budget aligns with market - Standard negotiation expected")
                 else:
-                    report += "\n   • 🔴 Budget below market average - Limited options"
+                    report_parts.append("\n   • 🔴 Budget below market average - Limited options")
         
         # Add negotiation recommendations
-        report += "\n\n🎯 **NEGOTIATION STRATEGY:**"
+        report_parts.append("\n\n🎯 **NEGOTIATION STRATEGY:**")
         if availability_rate > 60:
-            report += "\n   • Leverage high availability for rent reductions"
-            report += "\n   • Request additional amenities or flexible terms"
+            report_parts.append("\n   • Leverage high availability for rent reductions")
+            report_parts.append("\n   • Request additional amenities or flexible terms")
         else:
-            report += "\n   • Act quickly on suitable properties"
-            report += "\n   • Be prepared to meet asking price"
+            report_parts.append("\n   • Act quickly on suitable properties")
+            report_parts.append("\n   • Be prepared to meet asking price")
         
-        if analysis_type == "pricing":
-            # Focus on price analysis only
-            price_summary = "\n\n�️ �📈 **DETAILED PRICING ANALYSIS:**\n"
-            price_summary += f"   • Market Average: £{avg_price:.0f}/month\n"
-            price_summary += f"   • Market Median: £{median_price:.0f}/month\n"
-            price_summary += f"   • Price Variance: {((max_price - min_price) / avg_price * 100):.1f}%\n"
-            return price_summary
-        
-        elif analysis_type == "availability":
-            # Focus on availability only
-            return f"🛠️ 🏠 **AVAILABILITY ANALYSIS:**\n   • {available_properties} out of {total_properties} properties available ({availability_rate:.1f}%)\n   • Market Status: {'Buyer\'s Market' if availability_rate > 60 else 'Seller\'s Market' if availability_rate < 40 else 'Balanced Market'}"
-        
-        elif analysis_type == "trends":
-            # Focus on trends (simplified for now)
-            return f"�️ �📈 **MARKET TRENDS:**\n   • Average rent in {location or 'analyzed area'}: £{avg_price:.0f}\n   • Most common property type: {type_stats.most_common(1)[0][0] if type_stats else 'N/A'}\n   • Availability trend: {availability_rate:.1f}% available"
+        report = "".join(report_parts)
         
         logger.info(f"🛠️ Market analysis completed for {location or 'general area'} - {total_properties} properties analyzed")
         return report
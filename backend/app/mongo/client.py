@@ -1,4 +1,5 @@
-from typing import Generic, Type, TypeVar
+from itertools import islice
+from typing import Generic, Iterable, Type, TypeVar
 
 from bson import ObjectId
 from loguru import logger
@@ -155,6 +156,36 @@ class MongoClientWrapper(Generic[T]):
             logger.error(f"Error inserting documents: {e}")
             raise
 
+    def bulk_insert(self, documents: Iterable[dict], batch_size: int = 1000) -> int:
+        """Insert raw documents in unordered batches.
+
+        Each batch is a single round-trip, and ``ordered=False`` lets the server
+        apply a batch's inserts without stopping at the first failure.
+
+        Args:
+            documents (Iterable[dict]): Documents to insert. As with ``insert_many``,
+                each dict gets its generated ``_id`` set in place.
+            batch_size (int, optional): Maximum documents per ``insert_many`` call.
+                Defaults to 1000.
+
+        Returns:
+            int: Number of documents inserted.
+
+        Raises:
+            errors.PyMongoError: If an insert batch fails.
+        """
+        inserted = 0
+        iterator = iter(documents)
+        try:
+            while batch := list(islice(iterator, batch_size)):
+                result = self.collection.insert_many(batch, ordered=False)
+                inserted += len(result.inserted_ids)
+            logger.debug("Bulk inserted {} documents into MongoDB.", inserted)
+            return inserted
+        except errors.PyMongoError as e:
+            logger.error(f"Error bulk inserting documents: {e}")
+            raise
+
     def fetch_documents(self, limit: int, query: dict) -> list[T]:
         """Retrieve documents from the MongoDB collection based on a query.
 
@@ -176,6 +207,25 @@ class MongoClientWrapper(Generic[T]):
             logger.error(f"Error fetching documents: {e}")
             raise
 
+    def aggregate(self, pipeline: list[dict]) -> list[dict]:
+        """Run an aggregation pipeline on the MongoDB collection.
+
+        Args:
+            pipeline (list[dict]): Aggregation stages to execute server-side.
+
+        Returns:
+            list[dict]: Raw documents produced by the pipeline. They are not
+                validated against the model since stages may reshape them.
+
+        Raises:
+            errors.PyMongoError: If the aggregation fails.
+        """
+        try:
+            return list(self.collection.aggregate(pipeline))
+        except errors.PyMongoError as e:
+            logger.error(f"Error running aggregation pipeline: {e}")
+            raise
+
     def __parse_documents(self, documents: list[dict]) -> list[T]:
         """Convert MongoDB documents to Pydantic model instances.
 
@@ -243,7 +293,7 @@ class MongoClientWrapper(Generic[T]):
         """
         try:
             result = self.collection.update_one(filter_query, update_data)
-            logger.debug(f"Updated document with filter: {filter_query}")
+            logger.debug("Updated document with filter: {}", filter_query)
             return result.matched_count > 0
         except errors.PyMongoError as e:
             logger.error(f"Error updating document: {e}")
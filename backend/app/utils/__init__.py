@@ -2,11 +2,13 @@ from app.utils.sci_style import SCIPlotStyle
 from app.utils.opik_utils import configure
 from app.utils.latex import RentalLatex, RentalInfo
 from app.utils.RateLimitBackOff import invoke_llm_sync_with_backoff
+from app.utils.clock import now_iso
 # from app.utils.history_logs import save_conversation_history
 __all__ = [
     "SCIPlotStyle",
     "configure",
     "RentalLatex",
     "RentalInfo",
-    "invoke_llm_sync_with_backoff"
+    "invoke_llm_sync_with_backoff",
+    "now_iso"
 ]
\ No newline at end of file
@@ -0,0 +1,24 @@
+"""
+Cached wall clock - ISO timestamps for outgoing messages, formatted at most once per second
+"""
+
+import time
+from datetime import datetime
+
+_cached_second = 0
+_cached_iso = ""
+
+
+def now_iso() -> str:
+    """
+    Return the current local time as an ISO string with second resolution
+
+    Every caller within the same wall-clock second shares one formatted string,
+    so hot message paths don't allocate and format a datetime per frame.
+    """
+    global _cached_second, _cached_iso
+    second = int(time.time())
+    if second != _cached_second:
+        _cached_second = second
+        _cached_iso = datetime.fromtimestamp(second).isoformat()
+    return _cached_iso
@@ -0,0 +1,127 @@
+"""
+Parity check between the MongoDB property ranking pipeline and calculate_property_match_score
+
+Seeds scratch collections with fixture landlords, properties and tenants, then checks
+that find_best_property_for_tenant picks the same property with the same score as
+scoring every available fixture in Python, the way matching worked before the
+pipeline. Needs the configured MongoDB.
+"""
+import asyncio
+
+from app.agents.models import LandlordModel, PropertyModel, TenantModel
+from app.agents.models.property_model import PropertyRentalStatus
+from app.api_service.group_negotiation import GroupNegotiationService, calculate_property_match_score
+from app.mongo import MongoClientWrapper
+
+
+FIXTURE_LANDLORDS = [
+    LandlordModel(landlord_id="parity-landlord-1", name="Parity Lettings"),
+    LandlordModel(landlord_id="parity-landlord-2", name="Parity Estates"),
+]
+
+# Insertion order matters: ties are broken by the first property inserted
+FIXTURE_PROPERTIES = [
+    # Unavailable properties must never win, however well they score
+    PropertyModel(property_id="parity-rented", bedrooms=2, landlord_id="parity-landlord-1",
+                  price={"amount": 900, "frequency": "monthly"},
+                  rental_status=PropertyRentalStatus(is_rented=True)),
+    PropertyModel(property_id="parity-occupied", bedrooms=2, landlord_id="parity-landlord-1",
+                  price={"amount": 900, "frequency": "monthly"},
+                  rental_status=PropertyRentalStatus(is_occupied=True)),
+    # Weekly and monthly rents that convert to the same monthly amount (1300)
+    PropertyModel(property_id="parity-weekly-2bed", bedrooms=2, landlord_id="parity-landlord-1",
+                  price={"amount": 300, "frequency": "weekly"}),
+    PropertyModel(property_id="parity-monthly-2bed", bedrooms=2, landlord_id="parity-landlord-2",
+                  price={"amount": 1300, "frequency": "monthly"}),
+    PropertyModel(property_id="parity-yearly-3bed", bedrooms=3, landlord_id="parity-landlord-2",
+                  price={"amount": 24000, "frequency": "yearly"}),
+    PropertyModel(property_id="parity-studio", bedrooms=0, landlord_id="parity-landlord-1",
+                  price={"amount": 900, "frequency": "monthly"}),
+    PropertyModel(property_id="parity-weekly-4bed", bedrooms=4, landlord_id="parity-landlord-2",
+                  price={"amount": 600, "frequency": "weekly"}),
+    PropertyModel(property_id="parity-5bed-house", bedrooms=5, landlord_id="parity-landlord-2",
+                  property_sub_type="House", price={"amount": 3500, "frequency": "monthly"}),
+]
+
+FIXTURE_TENANTS = [
+    TenantModel(tenant_id="parity-student", max_budget=1500, min_bedrooms=1, max_bedrooms=1,
+                is_student=True),
+    TenantModel(tenant_id="parity-tie", max_budget=2000, min_bedrooms=2, max_bedrooms=2),
+    TenantModel(tenant_id="parity-budget-edge", max_budget=2000, min_bedrooms=3, max_bedrooms=3,
+                is_smoker=True),
+    TenantModel(tenant_id="parity-family", max_budget=2800, min_bedrooms=3, max_bedrooms=4,
+                has_pets=True, num_occupants=4),
+    # Nothing is within budget, so matching falls back to every available property
+    TenantModel(tenant_id="parity-over-budget", max_budget=500, min_bedrooms=5, max_bedrooms=6,
+                has_pets=True, is_smoker=True),
+]
+
+
+def python_best_match(tenant: TenantModel, properties: list[PropertyModel]) -> tuple[str | None, float]:
+    """Rank properties one by one: in-budget ones first, the first highest score wins"""
+    pref_set = frozenset(
+        loc.lower() for loc in tenant.preferred_locations if isinstance(loc, str)
+    )
+    available = [
+        prop for prop in properties
+        if not prop.rental_status.is_rented and not prop.rental_status.is_occupied
+    ]
+    candidates = [prop for prop in available if prop.monthly_rent <= tenant.max_budget] or available
+
+    best_id, best_score = None, 0
+    for prop in candidates:
+        property_dict = prop.to_dict()
+        property_dict["monthly_rent"] = prop.monthly_rent
+        score, _ = calculate_property_match_score(
+            tenant, property_dict, pref_set, tenant.max_budget * 0.8,
+            tenant.min_bedrooms, tenant.max_bedrooms,
+        )
+        if score > best_score:
+            best_id, best_score = prop.property_id, score
+    return best_id, best_score
+
+
+async def main():
+    landlords_db = MongoClientWrapper(model=LandlordModel, collection_name="parity_landlords")
+    properties_db = MongoClientWrapper(model=PropertyModel, collection_name="parity_properties")
+    tenants_db = MongoClientWrapper(model=TenantModel, collection_name="parity_tenants")
+    scratch = [landlords_db, properties_db, tenants_db]
+
+    try:
+        for db in scratch:
+            db.clear_collection()
+        landlords_db.bulk_insert(landlord.model_dump() for landlord in FIXTURE_LANDLORDS)
+        properties_db.bulk_insert(prop.model_dump() for prop in FIXTURE_PROPERTIES)
+        tenants_db.bulk_insert(tenant.model_dump() for tenant in FIXTURE_TENANTS)
+
+        service = GroupNegotiationService()
+        service.landlords_db = landlords_db
+        service.properties_db = properties_db
+        service.tenants_db = tenants_db
+
+        failures = 0
+        for tenant in FIXTURE_TENANTS:
+            expected_id, expected_score = python_best_match(tenant, FIXTURE_PROPERTIES)
+            match = await service.find_best_property_for_tenant(tenant.tenant_id)
+            got_id = match["property_id"] if match else None
+            got_score = match["score"] if match else 0
+
+            ok = got_id == expected_id and got_score == expected_score
+            if match:
+                # The landlord is joined by the pipeline rather than looked up afterwards
+                ok = ok and (match["landlord"] or {}).get("landlord_id") == match["landlord_id"]
+            failures += not ok
+            print(f"{'✅' if ok else '❌'} {tenant.tenant_id}: pipeline={got_id} ({got_score}), "
+                  f"python={expected_id} ({expected_score})")
+
+        print(f"\n{len(FIXTURE_TENANTS) - failures}/{len(FIXTURE_TENANTS)} tenants matched identically")
+        if failures:
+            raise SystemExit(1)
+    finally:
+        for db in scratch:
+            db.collection.drop()
+            db.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())